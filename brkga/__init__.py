@@ -0,0 +1,17 @@
+# Núcleo do BRKGA para o corte de camisas em rolos de tecido.
+# Só depende do numpy: pygame (brkga.visual) e matplotlib (brkga.experimentos,
+# ao plotar) ficam fora da importação do pacote.
+from .checkpoint import carregar_checkpoint, elites_de_checkpoint, sementes_de_csv
+from .colunas import limite_inferior_lp, resolver_colunas, sementes_colunas
+from .decoders import (
+    DECODERS, DecodificadorIncremental, FitnessCache, chaves_de_sequencia, decode, decode_batch, fitness,
+    fitness_batch, num_genes,
+)
+from .ga import (
+    avaliar_populacao, biased_crossover, biased_crossover_batch, brgka_simples, proxima_geracao,
+    random_individual, random_population, ranquear,
+)
+from .ilhas import brkga_ilhas
+from .instancia import INSTANCIA, Instance
+from .instrumentacao import GravadorMetricas, ResumoFases
+from .paralelo import AvaliadorParalelo
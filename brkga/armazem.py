@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from .decoders import chaves_de_sequencia
+from .instancia import INSTANCIA
+
+# ========= ARMAZÉM BINÁRIO DE RESULTADOS =========
+# Todas as execuções num só lugar, só com anexação, em três arquivos:
+#   <base>.idx        índice: um registro de tamanho fixo (INDICE_DTYPE) por execução,
+#                     lido inteiro com np.fromfile e filtrado por máscara
+#   <base>.dat        soluções compactas: códigos dos tipos (uint8) na ordem de corte,
+#                     seguidos do número de camisas de cada bin (uint16)
+#   <base>.cat.jsonl  catálogo: instância e parâmetros por trás de cada assinatura
+# A solução é gravada antes do registro no índice, então uma gravação interrompida
+# deixa no máximo bytes órfãos no .dat. Os CSV e PNG de brkga_resultados continuam
+# como exportação (exportar_csv).
+
+INDICE_DTYPE = np.dtype([
+    ("instancia", "S8"),       # assinatura da instância (tipos, tamanhos, demanda, rolo)
+    ("parametros", "S8"),      # assinatura dos parâmetros do GA
+    ("geracoes", "<i8"),
+    ("semente", "<u8"),
+    ("repeticao", "<i4"),
+    ("num_bins", "<i4"),
+    ("tempo", "<f8"),          # duração da execução, em segundos
+    ("desperdicio", "<f8"),    # em metros
+    ("motivo", "S12"),
+    ("inicio", "<i8"),         # posição da solução no .dat, em bytes
+    ("num_itens", "<i4"),
+    ("data", "<f8"),           # time.time() da gravação
+])
+
+def _assinatura(dados):
+    return hashlib.blake2b(json.dumps(dados, sort_keys=True).encode("utf-8"), digest_size=8).digest()
+
+def descrever_instancia(instancia):
+    # Na ordem dos tipos da instância: os códigos gravados no .dat são índices aqui
+    return {
+        "tipos": list(instancia.tipos),
+        "tamanhos": instancia.tamanhos_tipo_int.tolist(),
+        "contagens": list(instancia.contagens),
+        "capacidade": instancia.capacidade_int,
+        "unidade": instancia.unidade,
+    }
+
+class ArmazemResultados:
+    def __init__(self, base):
+        # base: caminho sem extensão; a pasta é criada se preciso
+        self.base = base
+        pasta = os.path.dirname(os.path.abspath(base))
+        os.makedirs(pasta, exist_ok=True)
+        self._indice = None
+        self._dados = None
+        self.catalogo = {}
+        if os.path.exists(base + ".cat.jsonl"):
+            with open(base + ".cat.jsonl", encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    entrada = json.loads(linha)
+                    self.catalogo[bytes.fromhex(entrada["assinatura"])] = entrada["descricao"]
+
+    def _catalogar(self, descricao):
+        assinatura = _assinatura(descricao)
+        if assinatura not in self.catalogo:
+            with open(self.base + ".cat.jsonl", "a", encoding="utf-8") as arquivo:
+                arquivo.write(json.dumps({"assinatura": assinatura.hex(), "descricao": descricao}) + "\n")
+            self.catalogo[assinatura] = descricao
+        return assinatura
+
+    def adicionar(self, instancia, parametros, geracoes, semente, repeticao, tempo, desperdicio, num_bins,
+                  sequencia_de_corte, motivo_parada):
+        codigo_do_tipo = {tipo: codigo for codigo, tipo in enumerate(instancia.tipos)}
+        codigos = np.array([codigo_do_tipo[tipo] for bin in sequencia_de_corte for tipo in bin], dtype=np.uint8)
+        tamanhos_bins = np.array([len(bin) for bin in sequencia_de_corte], dtype="<u2")
+
+        with open(self.base + ".dat", "ab") as arquivo:
+            inicio = arquivo.tell()
+            arquivo.write(codigos.tobytes())
+            arquivo.write(tamanhos_bins.tobytes())
+
+        registro = np.zeros(1, dtype=INDICE_DTYPE)
+        registro["instancia"] = self._catalogar({"instancia": descrever_instancia(instancia)})
+        registro["parametros"] = self._catalogar({"parametros": parametros})
+        registro["geracoes"] = geracoes
+        registro["semente"] = 0 if semente is None else semente
+        registro["repeticao"] = repeticao
+        registro["num_bins"] = num_bins
+        registro["tempo"] = tempo
+        registro["desperdicio"] = desperdicio
+        registro["motivo"] = motivo_parada.encode("ascii")
+        registro["inicio"] = inicio
+        registro["num_itens"] = len(codigos)
+        registro["data"] = time.time()
+        with open(self.base + ".idx", "ab") as arquivo:
+            arquivo.write(registro.tobytes())
+        self._indice = None
+        self._dados = None
+
+    @property
+    def indice(self):
+        # Array estruturado com um registro por execução, na ordem de gravação
+        if self._indice is None:
+            caminho = self.base + ".idx"
+            if not os.path.exists(caminho):
+                return np.zeros(0, dtype=INDICE_DTYPE)
+            # Um registro incompleto no fim (gravação interrompida) é ignorado
+            quantidade = os.path.getsize(caminho) // INDICE_DTYPE.itemsize
+            self._indice = np.fromfile(caminho, dtype=INDICE_DTYPE, count=quantidade)
+        return self._indice
+
+    def __len__(self):
+        return len(self.indice)
+
+    def consultar(self, instancia=None, parametros=None, geracoes=None, semente=None):
+        # Índices das execuções que batem com todos os filtros dados
+        indice = self.indice
+        mascara = np.ones(len(indice), dtype=bool)
+        if instancia is not None:
+            mascara &= indice["instancia"] == _assinatura({"instancia": descrever_instancia(instancia)})
+        if parametros is not None:
+            mascara &= indice["parametros"] == _assinatura({"parametros": parametros})
+        if geracoes is not None:
+            mascara &= indice["geracoes"] == geracoes
+        if semente is not None:
+            mascara &= indice["semente"] == semente
+        return np.flatnonzero(mascara)
+
+    def solucao(self, linha):
+        # Sequência de corte da execução, como a devolvida pelo brgka_simples
+        if self._dados is None:
+            self._dados = np.fromfile(self.base + ".dat", dtype=np.uint8)
+        registro = self.indice[linha]
+        tipos = self.catalogo[registro["instancia"]]["instancia"]["tipos"]
+        inicio = int(registro["inicio"])
+        fim_codigos = inicio + int(registro["num_itens"])
+        codigos = self._dados[inicio:fim_codigos].tolist()
+        tamanhos_bins = np.frombuffer(self._dados[fim_codigos:fim_codigos + 2 * int(registro["num_bins"])], "<u2")
+        limites = [0] + np.cumsum(tamanhos_bins, dtype=np.int64).tolist()
+        return [[tipos[codigo] for codigo in codigos[a:b]] for a, b in zip(limites, limites[1:])]
+
+    def parametros(self, linha):
+        return self.catalogo[self.indice[linha]["parametros"]]["parametros"]
+
+    def linhas_csv(self, linhas=None):
+        # Execuções no formato das linhas do CSV de resultados (CABECALHO_CSV)
+        from .experimentos import texto_parametros
+        if linhas is None:
+            linhas = range(len(self))
+        indice = self.indice
+        return [
+            (int(indice["geracoes"][k]), float(indice["tempo"][k]), float(indice["desperdicio"][k]),
+             int(indice["repeticao"][k]), int(indice["num_bins"][k]), self.solucao(k),
+             indice["motivo"][k].decode("ascii"), int(indice["semente"][k]),
+             texto_parametros(self.parametros(k)))
+            for k in linhas
+        ]
+
+    def exportar_csv(self, csv_filename, linhas=None):
+        from .experimentos import salvar_csv
+        salvar_csv(self.linhas_csv(linhas), csv_filename)
+
+    def sementes(self, instancia=INSTANCIA, max_sementes=None):
+        # Partida a quente: as melhores execuções desta instância, já como chaves
+        # (matriz (0, num_itens) se o armazém não tiver execuções dela)
+        linhas = self.consultar(instancia=instancia)
+        if len(linhas) == 0:
+            return np.empty((0, instancia.num_itens))
+        linhas = linhas[np.argsort(self.indice["desperdicio"][linhas], kind="stable")][:max_sementes]
+        return np.array([chaves_de_sequencia(self.solucao(k), instancia) for k in linhas])
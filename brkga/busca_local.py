@@ -0,0 +1,125 @@
+import numpy as np
+
+from .decoders import DECODER_PADROES, chaves_de_sequencia, decode, fitness
+from .instancia import INSTANCIA
+from .parametros import DECODER, MAX_MOVIMENTOS_BUSCA_LOCAL
+
+# ========= BUSCA LOCAL NAS BINS =========
+# Pós-otimização das elites direto sobre as bins do decode(). Cada bin vira uma
+# linha de contagens por tipo; os movimentos são junção de dois bins, mover uma
+# camisa de um bin para outro e trocar camisas de tipos diferentes entre dois
+# bins. A avaliação é por delta da soma dos quadrados das cargas: ela só cresce
+# quando um bin mais cheio fica ainda mais cheio, o que esvazia os bins fracos
+# até sumirem. Os deltas de todos os pares de bins saem de uma vez pelo numpy.
+
+def busca_local_bins(contagens, instancia=INSTANCIA, max_movimentos=MAX_MOVIMENTOS_BUSCA_LOCAL):
+    # contagens: matriz (num_bins, num_tipos). Aplica o melhor movimento até não haver
+    # melhoria (ou max_movimentos) e devolve a nova matriz, sem bins vazios
+    tamanhos = instancia.tamanhos_tipo_int
+    capacidade = instancia.capacidade_int
+    contagens = np.array(contagens, dtype=np.int64)
+    num_tipos = len(tamanhos)
+
+    for _ in range(max_movimentos):
+        num_bins = len(contagens)
+        if num_bins < 2:
+            break
+        cargas = contagens @ tamanhos
+        outro_bin = ~np.eye(num_bins, dtype=bool)
+
+        # Junção: o par de bins de menor carga somada, se couber num só
+        soma = np.where(outro_bin, cargas[:, None] + cargas[None, :], capacidade + 1)
+        i, j = np.unravel_index(soma.argmin(), soma.shape)
+        if soma[i, j] <= capacidade:
+            contagens[j] += contagens[i]
+            contagens = np.delete(contagens, i, axis=0)
+            continue
+
+        # diferenca[i, j] = carga de j - carga de i
+        diferenca = cargas[None, :] - cargas[:, None]
+        melhor_delta = 0
+        melhor_movimento = None
+        for t in range(num_tipos):
+            tem_t = contagens[:, t] > 0
+            s = tamanhos[t]
+            # Mover uma camisa t do bin i para o bin j
+            viavel = tem_t[:, None] & (cargas[None, :] + s <= capacidade) & outro_bin
+            delta = np.where(viavel, 2 * s * (diferenca + s), 0)
+            k = delta.argmax()
+            if delta.flat[k] > melhor_delta:
+                melhor_delta = delta.flat[k]
+                melhor_movimento = ("mover", t, None, *np.unravel_index(k, delta.shape))
+            # Trocar: o bin i entrega t e recebe u (maior), o bin j faz o contrário
+            for u in range(num_tipos):
+                d = tamanhos[u] - s
+                if d <= 0:
+                    continue
+                viavel = (tem_t & (cargas + d <= capacidade))[:, None] & (contagens[:, u] > 0)[None, :] & outro_bin
+                delta = np.where(viavel, 2 * d * (d - diferenca), 0)
+                k = delta.argmax()
+                if delta.flat[k] > melhor_delta:
+                    melhor_delta = delta.flat[k]
+                    melhor_movimento = ("trocar", t, u, *np.unravel_index(k, delta.shape))
+
+        if melhor_movimento is None:
+            break
+        movimento, t, u, i, j = melhor_movimento
+        contagens[i, t] -= 1
+        contagens[j, t] += 1
+        if movimento == "trocar":
+            contagens[j, u] -= 1
+            contagens[i, u] += 1
+        else:
+            contagens = contagens[contagens.any(axis=1)]
+
+    return contagens
+
+def melhorar_individuo(individuo, instancia=INSTANCIA, decoder=DECODER,
+                       max_movimentos=MAX_MOVIMENTOS_BUSCA_LOCAL):
+    # Busca local nas bins do indivíduo e volta para chaves: as bins melhoradas, das
+    # mais cheias para as mais vazias, viram a nova ordem de corte, reaproveitando os
+    # mesmos valores de chave. Retorna (novo_individuo, desperdicio) se o desperdício
+    # caiu, senão None. Não se aplica à codificação por padrões.
+    if decoder == DECODER_PADROES:
+        return None
+    bins, desperdicio = decode(individuo, instancia, decoder)
+    codigo_do_tipo = {tipo: codigo for codigo, tipo in enumerate(instancia.tipos)}
+    contagens = np.zeros((len(bins), len(instancia.tipos)), dtype=np.int64)
+    for b, bin in enumerate(bins):
+        for _, tipo, _ in bin:
+            contagens[b, codigo_do_tipo[tipo]] += 1
+
+    contagens = busca_local_bins(contagens, instancia, max_movimentos)
+    if len(contagens) >= len(bins):
+        return None
+
+    tamanhos = instancia.tamanhos_tipo_int
+    por_tamanho = np.argsort(-tamanhos, kind="stable").tolist()
+    sequencia_de_corte = [
+        [instancia.tipos[t] for t in por_tamanho for _ in range(bin[t])]
+        for bin in contagens[np.argsort(-(contagens @ tamanhos), kind="stable")].tolist()
+    ]
+    chaves = chaves_de_sequencia(sequencia_de_corte, instancia)
+    novo = np.empty_like(individuo)
+    novo[np.argsort(chaves, kind="stable")] = np.sort(individuo)
+
+    # O decoder pode não reproduzir exatamente as bins: só vale se melhorou de fato
+    novo_desperdicio = fitness(novo, instancia, decoder)
+    if novo_desperdicio < desperdicio:
+        return novo, novo_desperdicio
+    return None
+
+def aplicar_busca_local(population, desperdicios, linhas, instancia=INSTANCIA, decoder=DECODER,
+                        incremental=None, max_movimentos=MAX_MOVIMENTOS_BUSCA_LOCAL):
+    # Melhora as linhas indicadas (em geral as melhores elites) no lugar, em population
+    # e desperdicios. Retorna quantas melhoraram.
+    melhoradas = 0
+    for linha in linhas:
+        resultado = melhorar_individuo(population[linha], instancia, decoder, max_movimentos)
+        if resultado is None:
+            continue
+        population[linha], desperdicios[linha] = resultado
+        if incremental is not None:
+            incremental.substituir(linha, population[linha])
+        melhoradas += 1
+    return melhoradas
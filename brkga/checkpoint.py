@@ -0,0 +1,86 @@
+import ast
+import csv
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from .decoders import chaves_de_sequencia
+from .instancia import INSTANCIA
+
+# ========= CHECKPOINT E PARTIDA A QUENTE =========
+# Um checkpoint guarda o estado do brgka_simples ao fim de uma geração: a nova
+# população (elites nas primeiras linhas), o contador de gerações, o melhor
+# indivíduo e o estado do np.random.Generator. É um .npz binário, gravado num
+# arquivo temporário e renomeado, para um processo morto no meio da escrita não
+# corromper o checkpoint anterior.
+
+# Versão do formato gravado, conferida na leitura
+VERSAO_CHECKPOINT = 2
+
+@dataclass(frozen=True, eq=False)
+class Checkpoint:
+    population: np.ndarray      # (pop_size, num_genes) da próxima geração
+    num_elites: int             # as primeiras linhas de population são as elites
+    geracao: int                # próxima geração a rodar
+    ultima_melhoria: int
+    tempo_decorrido: float      # segundos já gastos antes do checkpoint
+    melhor_individuo: np.ndarray
+    melhor_desperdicio: float
+    decoder: str
+    estado_rng: dict            # rng.bit_generator.state
+
+def salvar_checkpoint(caminho, checkpoint):
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        np.savez(
+            arquivo,
+            versao=VERSAO_CHECKPOINT,
+            population=checkpoint.population,
+            num_elites=checkpoint.num_elites,
+            geracao=checkpoint.geracao,
+            ultima_melhoria=checkpoint.ultima_melhoria,
+            tempo_decorrido=checkpoint.tempo_decorrido,
+            melhor_individuo=checkpoint.melhor_individuo,
+            melhor_desperdicio=checkpoint.melhor_desperdicio,
+            decoder=checkpoint.decoder,
+            # O estado do PCG64 tem inteiros de 128 bits: vai como texto JSON
+            estado_rng=json.dumps(checkpoint.estado_rng),
+        )
+    os.replace(temporario, caminho)
+
+def carregar_checkpoint(caminho):
+    with np.load(caminho) as dados:
+        if int(dados["versao"]) != VERSAO_CHECKPOINT:
+            raise ValueError(f"Checkpoint {caminho} tem versão {int(dados['versao'])}, "
+                             f"esperada {VERSAO_CHECKPOINT}")
+        return Checkpoint(
+            population=dados["population"],
+            num_elites=int(dados["num_elites"]),
+            geracao=int(dados["geracao"]),
+            ultima_melhoria=int(dados["ultima_melhoria"]),
+            tempo_decorrido=float(dados["tempo_decorrido"]),
+            melhor_individuo=dados["melhor_individuo"],
+            melhor_desperdicio=float(dados["melhor_desperdicio"]),
+            decoder=str(dados["decoder"]),
+            estado_rng=json.loads(str(dados["estado_rng"])),
+        )
+
+def elites_de_checkpoint(caminho):
+    # Partida a quente: melhor indivíduo seguido das elites do checkpoint, para
+    # passar como populacao_inicial de uma nova execução
+    checkpoint = carregar_checkpoint(caminho)
+    return np.vstack((checkpoint.melhor_individuo, checkpoint.population[:checkpoint.num_elites]))
+
+def sementes_de_csv(csv_filename, instancia=INSTANCIA):
+    # Partida a quente a partir dos Melhor_Solucao de um CSV de brkga_resultados:
+    # cada sequência de corte vira um vetor de chaves (codificação por item),
+    # do menor para o maior desperdício
+    linhas = []
+    with open(csv_filename, newline='', encoding='utf-8') as file:
+        for linha in csv.DictReader(file):
+            sequencia_de_corte = ast.literal_eval(linha["Melhor_Solucao"])
+            linhas.append((float(linha["Desperdicio_m"]), sequencia_de_corte))
+    linhas.sort(key=lambda linha: linha[0])
+    return np.array([chaves_de_sequencia(sequencia, instancia) for _, sequencia in linhas])
@@ -0,0 +1,177 @@
+import math
+
+import numpy as np
+
+from .decoders import chaves_de_sequencia
+from .instancia import INSTANCIA
+from .padroes import padroes_da_instancia
+
+# ========= GERAÇÃO DE COLUNAS (GILMORE-GOMORY) =========
+# Segundo motor ao lado do BRKGA. Com poucos tipos e um rolo curto, o conjunto
+# de padrões de corte viáveis é pequeno: a relaxação linear
+#     min sum(x_p)  s.a.  sum(a_p * x_p) >= demanda,  x >= 0
+# é resolvida por geração de colunas sobre esses padrões, e o plano inteiro sai
+# por arredondamento. O valor do LP dá um limite inferior de bins.
+
+# Tolerância numérica do simplex e da precificação
+EPS_LP = 1e-9
+
+def _simplex_max(restricoes, limites, custos):
+    # max custos·y  s.a.  restricoes @ y <= limites, y >= 0, com limites >= 0.
+    # Simplex de tableau com a regra de Bland (sem ciclagem); as folgas formam a
+    # base inicial. Retorna (valor, y, duais), onde duais são os multiplicadores
+    # das restrições, lidos na linha de custos das colunas de folga.
+    num_linhas, num_colunas = restricoes.shape
+    tableau = np.zeros((num_linhas + 1, num_colunas + num_linhas + 1))
+    tableau[:num_linhas, :num_colunas] = restricoes
+    tableau[:num_linhas, num_colunas:num_colunas + num_linhas] = np.eye(num_linhas)
+    tableau[:num_linhas, -1] = limites
+    tableau[num_linhas, :num_colunas] = -np.asarray(custos, dtype=np.float64)
+    base = list(range(num_colunas, num_colunas + num_linhas))
+
+    while True:
+        negativos = np.flatnonzero(tableau[num_linhas, :-1] < -EPS_LP)
+        if len(negativos) == 0:
+            break
+        entra = negativos[0]
+        coluna = tableau[:num_linhas, entra]
+        candidatas = [
+            (tableau[i, -1] / coluna[i], base[i], i) for i in range(num_linhas) if coluna[i] > EPS_LP
+        ]
+        if not candidatas:
+            raise ValueError("LP ilimitado")
+        _, _, sai = min(candidatas)
+        tableau[sai] /= tableau[sai, entra]
+        for i in range(num_linhas + 1):
+            if i != sai and tableau[i, entra] != 0.0:
+                tableau[i] -= tableau[i, entra] * tableau[sai]
+        base[sai] = entra
+
+    y = np.zeros(num_colunas)
+    for i, j in enumerate(base):
+        if j < num_colunas:
+            y[j] = tableau[i, -1]
+    duais = tableau[num_linhas, num_colunas:num_colunas + num_linhas].copy()
+    return tableau[num_linhas, -1], y, duais
+
+def relaxacao_linear(instancia=INSTANCIA, max_iteracoes=1000):
+    # Geração de colunas: o mestre restrito é resolvido pelo dual
+    # (max demanda·y s.a. a_p·y <= 1 para cada padrão do mestre), e a precificação
+    # procura, entre todos os padrões viáveis, o de maior valor dual a_p·y.
+    # Retorna (valor_lp, padroes, x) com os padrões do mestre e suas multiplicidades.
+    todos = padroes_da_instancia(instancia).matriz
+    demanda = np.array(instancia.contagens, dtype=np.float64)
+    if not len(todos):
+        return 0.0, todos, np.zeros(0)
+
+    # Mestre inicial: padrões homogêneos com o máximo de cada tipo
+    iniciais = []
+    for t in range(len(demanda)):
+        homogeneos = np.flatnonzero((todos[:, t] > 0) & (todos.sum(axis=1) == todos[:, t]))
+        if len(homogeneos):
+            iniciais.append(homogeneos[todos[homogeneos, t].argmax()])
+    mestre = sorted(set(iniciais))
+
+    for _ in range(max_iteracoes):
+        valor, y, x = _simplex_max(todos[mestre].astype(np.float64), np.ones(len(mestre)), demanda)
+        reduzidos = todos @ y
+        melhor = int(reduzidos.argmax())
+        if reduzidos[melhor] <= 1 + EPS_LP or melhor in mestre:
+            break
+        mestre.append(melhor)
+
+    return valor, todos[mestre], x
+
+def limite_inferior_lp(instancia=INSTANCIA):
+    # Limite inferior de bins (e do desperdício correspondente) pela relaxação linear,
+    # nunca pior que o limite trivial pelo tamanho total
+    valor, _, _ = relaxacao_linear(instancia)
+    limite_bins = max(instancia.limite_inferior_bins, math.ceil(valor - 1e-6))
+    tamanho_total = int(instancia.tamanhos_tipo_int @ np.array(instancia.contagens, dtype=np.int64))
+    return limite_bins, (limite_bins * instancia.capacidade_int - tamanho_total) / instancia.unidade
+
+def _ffd(restante, instancia):
+    # First-fit decreasing da demanda residual; devolve padrões (contagens por tipo)
+    tamanhos_tipo = instancia.tamanhos_tipo_int.tolist()
+    capacidade = instancia.capacidade_int
+    itens = sorted(
+        (t for t, qtd in enumerate(restante) for _ in range(qtd)),
+        key=lambda t: -tamanhos_tipo[t],
+    )
+    bins = []
+    cargas = []
+    for t in itens:
+        for b, carga in enumerate(cargas):
+            if carga + tamanhos_tipo[t] <= capacidade:
+                bins[b][t] += 1
+                cargas[b] += tamanhos_tipo[t]
+                break
+        else:
+            novo = [0] * len(tamanhos_tipo)
+            novo[t] = 1
+            bins.append(novo)
+            cargas.append(tamanhos_tipo[t])
+    return bins
+
+def _retirar_excedente(plano, demanda):
+    # O LP cobre a demanda com ">=": tira dos últimos bins as camisas que sobram
+    excedente = [sum(bin[t] for bin in plano) - demanda[t] for t in range(len(demanda))]
+    for t, sobra in enumerate(excedente):
+        for bin in reversed(plano):
+            if sobra <= 0:
+                break
+            retirar = min(sobra, bin[t])
+            bin[t] -= retirar
+            sobra -= retirar
+    return [bin for bin in plano if any(bin)]
+
+def _arredondar(padroes, x, instancia):
+    # Dois arredondamentos da solução fracionária, fica o de menos bins:
+    # piso + FFD da demanda residual, ou teto; em ambos o excedente é retirado
+    demanda = list(instancia.contagens)
+    planos = []
+
+    piso = np.floor(x + EPS_LP).astype(np.int64)
+    plano = [list(padrao) for padrao, copias in zip(padroes.tolist(), piso.tolist()) for _ in range(copias)]
+    plano = _retirar_excedente(plano, demanda)
+    produzido = [sum(bin[t] for bin in plano) for t in range(len(demanda))]
+    restante = [d - p for d, p in zip(demanda, produzido)]
+    planos.append(plano + _ffd(restante, instancia))
+
+    teto = np.ceil(x - EPS_LP).astype(np.int64)
+    plano = [list(padrao) for padrao, copias in zip(padroes.tolist(), teto.tolist()) for _ in range(copias)]
+    plano = _retirar_excedente(plano, demanda)
+    if all(sum(bin[t] for bin in plano) == demanda[t] for t in range(len(demanda))):
+        planos.append(plano)
+
+    return min(planos, key=len)
+
+def resolver_colunas(instancia=INSTANCIA):
+    # Mesmo formato de retorno do brgka_simples:
+    # (num_bins, desperdicio, sequencia_de_corte, motivo_parada), com motivo_parada
+    # "otimo" quando o plano atinge o limite inferior do LP e "arredondamento" caso contrário
+    valor, padroes, x = relaxacao_linear(instancia)
+    plano = _arredondar(padroes, x, instancia)
+
+    tipos = instancia.tipos
+    tamanhos_tipo = instancia.tamanhos_tipo_int.tolist()
+    capacidade = instancia.capacidade_int
+    # Padrões mais cheios primeiro
+    plano.sort(key=lambda bin: -sum(qtd * tamanhos_tipo[t] for t, qtd in enumerate(bin)))
+
+    sequencia_de_corte = [[tipos[t] for t, qtd in enumerate(bin) for _ in range(qtd)] for bin in plano]
+    desperdicio = 0
+    for bin in plano:
+        desperdicio += capacidade - sum(qtd * tamanhos_tipo[t] for t, qtd in enumerate(bin))
+    desperdicio /= instancia.unidade
+
+    limite_bins = max(instancia.limite_inferior_bins, math.ceil(valor - 1e-6))
+    motivo_parada = "otimo" if len(plano) <= limite_bins else "arredondamento"
+    return len(plano), desperdicio, sequencia_de_corte, motivo_parada
+
+def sementes_colunas(instancia=INSTANCIA):
+    # Para iniciar o BRKGA a partir do plano da geração de colunas: devolve
+    # (populacao_inicial, limite_inferior_desperdicio) para brgka_simples
+    _, _, sequencia_de_corte, _ = resolver_colunas(instancia)
+    _, limite_desperdicio = limite_inferior_lp(instancia)
+    return chaves_de_sequencia(sequencia_de_corte, instancia)[None, :], limite_desperdicio
@@ -0,0 +1,77 @@
+import csv
+
+from .parametros import INTERVALO_CONVERGENCIA, PONTOS_HISTORICO
+
+# ========= REGISTRO DE CONVERGÊNCIA EM FLUXO =========
+# Substitui a lista com o desperdício de todas as gerações: mínimo e máximo são
+# mantidos incrementalmente, o histórico em memória tem no máximo
+# PONTOS_HISTORICO pontos (ao encher, fica um a cada dois e o passo dobra) e,
+# com um caminho, os registros vão para um CSV à medida que a execução avança.
+
+CABECALHO_CONVERGENCIA = ["Geracao", "Desperdicio_m"]
+
+class RegistroConvergencia:
+    def __init__(self, caminho=None, intervalo=INTERVALO_CONVERGENCIA, so_melhorias=False,
+                 max_pontos=PONTOS_HISTORICO):
+        # caminho: CSV de saída (None = só memória); intervalo: gerações entre linhas
+        # do arquivo; so_melhorias: grava só quando o melhor desperdício cai
+        self.intervalo = intervalo
+        self.so_melhorias = so_melhorias
+        self.max_pontos = max_pontos
+        self.minimo = float("inf")
+        self.maximo = float("-inf")
+        self.num_registros = 0
+        self._pontos = []
+        self._passo = 1
+        self._arquivo = None
+        if caminho is not None:
+            self._arquivo = open(caminho, "w", newline="", encoding="utf-8")
+            self._escritor = csv.writer(self._arquivo)
+            self._escritor.writerow(CABECALHO_CONVERGENCIA)
+
+    def registrar(self, geracao, desperdicio):
+        melhorou = desperdicio < self.minimo
+        self.minimo = min(self.minimo, desperdicio)
+        self.maximo = max(self.maximo, desperdicio)
+
+        if self.num_registros % self._passo == 0:
+            self._pontos.append(desperdicio)
+            if len(self._pontos) >= self.max_pontos:
+                del self._pontos[1::2]
+                self._passo *= 2
+        self.num_registros += 1
+
+        if self._arquivo is not None:
+            if melhorou if self.so_melhorias else geracao % self.intervalo == 0:
+                self._escritor.writerow((geracao, desperdicio))
+                if melhorou:
+                    self._arquivo.flush()
+
+    def __call__(self, registro):
+        # Observador do brgka_simples (veja brkga.instrumentacao)
+        self.registrar(registro["geracao"], registro["melhor"])
+
+    def historico(self):
+        # Desperdícios amostrados, em ordem, para o gráfico
+        return self._pontos
+
+    def close(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def carregar_convergencia(caminho):
+    # Lê um CSV de convergência: listas (geracoes, desperdicios)
+    geracoes = []
+    desperdicios = []
+    with open(caminho, newline="", encoding="utf-8") as file:
+        for linha in csv.DictReader(file):
+            geracoes.append(int(linha["Geracao"]))
+            desperdicios.append(float(linha["Desperdicio_m"]))
+    return geracoes, desperdicios
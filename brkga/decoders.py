@@ -0,0 +1,395 @@
+import bisect
+import heapq
+from collections import OrderedDict
+
+import numpy as np
+
+from .instancia import INSTANCIA
+from .padroes import decode_padroes, decode_padroes_batch, num_genes_padroes
+from .parametros import DECODER
+
+# ========= ESTRATÉGIAS DE DECODIFICAÇÃO =========
+# Cada estratégia recebe a sequência de códigos de tipo (na ordem das chaves), os
+# tamanhos por código e a capacidade, e devolve (bins, cargas): as posições da
+# sequência em cada bin e a carga de cada bin, na ordem em que os bins foram abertos.
+# Tamanhos e capacidade chegam em unidades inteiras (Instance.tamanhos_tipo_int):
+# as comparações com a capacidade são exatas.
+
+def _empacotar_next_fit(codigos, tamanhos_tipo, capacidade):
+    # Divide a sequencia, tentando ocupar todo o bin, na medida do possível
+    bins = []
+    cargas = []
+    current_bin = []
+    current_sum = 0
+    for i, codigo in enumerate(codigos):
+        size = tamanhos_tipo[codigo]
+        if current_sum + size <= capacidade:
+            current_bin.append(i)
+            current_sum += size
+        else:
+            bins.append(current_bin)
+            cargas.append(current_sum)
+            current_bin = [i]
+            current_sum = size
+    if current_bin:
+        bins.append(current_bin)
+        cargas.append(current_sum)
+    return bins, cargas
+
+def _empacotar_first_fit(codigos, tamanhos_tipo, capacidade):
+    # Cada item vai para o primeiro bin (o aberto há mais tempo) onde ainda cabe.
+    # Árvore de segmentos de máximo sobre a capacidade restante dos bins: a busca
+    # desce sempre para o filho da esquerda que comporta o item, O(log n) por item.
+    folhas = 1
+    while folhas < max(1, len(codigos)):
+        folhas *= 2
+    arvore = [capacidade] * (2 * folhas)
+    bins = []
+    cargas = []
+    for i, codigo in enumerate(codigos):
+        size = tamanhos_tipo[codigo]
+        no = 1
+        while no < folhas:
+            no = 2 * no if arvore[2 * no] >= size else 2 * no + 1
+        b = no - folhas
+        if b == len(bins):
+            bins.append([])
+            cargas.append(0)
+        bins[b].append(i)
+        cargas[b] += size
+        arvore[no] = capacidade - cargas[b]
+        no //= 2
+        while no:
+            arvore[no] = max(arvore[2 * no], arvore[2 * no + 1])
+            no //= 2
+    return bins, cargas
+
+def _empacotar_best_fit(codigos, tamanhos_tipo, capacidade):
+    # Cada item vai para o bin com a menor capacidade restante que ainda o comporta
+    # (no empate, o aberto há mais tempo). Os resíduos são inteiros de 0 a capacidade:
+    # um balde por valor de resíduo (heap dos bins com aquele resíduo) e um bitset
+    # (int) dos baldes não vazios. O menor resíduo >= tamanho é o bit menos
+    # significativo de bitset >> tamanho: O(C / 64) operações de palavra em C, sem
+    # depender do número de bins; o heap do balde custa O(log n) no pior caso.
+    # Bins com resíduo menor que o menor item nunca mais recebem nada e ficam fora.
+    menor_item = min(tamanhos_tipo)
+    ocupados = 0
+    baldes = {}
+    bins = []
+    cargas = []
+    for i, codigo in enumerate(codigos):
+        size = tamanhos_tipo[codigo]
+        acima = ocupados >> size
+        if acima:
+            residuo = size + (acima & -acima).bit_length() - 1
+            balde = baldes[residuo]
+            b = heapq.heappop(balde)
+            if not balde:
+                ocupados ^= 1 << residuo
+        else:
+            b = len(bins)
+            bins.append([])
+            cargas.append(0)
+        bins[b].append(i)
+        cargas[b] += size
+        residuo = capacidade - cargas[b]
+        if residuo >= menor_item:
+            balde = baldes.get(residuo)
+            if balde:
+                heapq.heappush(balde, b)
+            else:
+                baldes[residuo] = [b]
+                ocupados |= 1 << residuo
+    return bins, cargas
+
+# Registro de estratégias; novas entradas seguem a mesma assinatura
+DECODERS = {
+    "next_fit": _empacotar_next_fit,
+    "first_fit": _empacotar_first_fit,
+    "best_fit": _empacotar_best_fit,
+}
+
+# Codificação agregada (veja padroes.py): os genes são dos padrões de corte, não das camisas
+DECODER_PADROES = "padroes"
+
+def num_genes(instancia=INSTANCIA, decoder=DECODER):
+    # Tamanho do cromossomo: um gene por camisa, ou dois por padrão de corte na codificação agregada
+    if decoder == DECODER_PADROES:
+        return num_genes_padroes(instancia)
+    return instancia.num_itens
+
+def decode(individual, instancia=INSTANCIA, decoder=DECODER):
+    # individual: vetor 1-D com num_genes(instancia, decoder) chaves
+    individual = np.asarray(individual)
+    if individual.ndim != 1 or len(individual) != num_genes(instancia, decoder):
+        raise ValueError(
+            f"decode espera um vetor de {num_genes(instancia, decoder)} chaves, recebeu forma {individual.shape}"
+        )
+    if decoder == DECODER_PADROES:
+        return decode_padroes(individual, instancia)
+
+    # Ordena índices pelo gene float (menor para maior); estável, como o sorted()
+    indices_ordenados = np.argsort(individual, kind="stable")
+
+    # Sequência de camisas (códigos de tipo) na ordem dos genes ordenados
+    individuo_ordenado = instancia.codigos[indices_ordenados].tolist()
+    tipos = instancia.tipos
+    tamanhos_tipo = instancia.tamanhos_tipo.tolist()
+    capacidade = instancia.capacidade_int
+
+    posicoes, cargas = DECODERS[decoder](
+        individuo_ordenado, instancia.tamanhos_tipo_int.tolist(), capacidade
+    )
+    bins = [
+        [(i, tipos[individuo_ordenado[i]], tamanhos_tipo[individuo_ordenado[i]]) for i in bin]
+        for bin in posicoes
+    ]
+    # Sobra somada em unidades inteiras e convertida para metros uma vez só
+    sobra_total = (len(cargas) * capacidade - sum(cargas)) / instancia.unidade
+
+    return bins, sobra_total
+
+def fitness(individual, instancia=INSTANCIA, decoder=DECODER):
+    bins_usados, sobra = decode(individual, instancia, decoder)
+    return sobra
+
+def chaves_de_sequencia(sequencia_de_corte, instancia=INSTANCIA):
+    # Caminho inverso do decode: chaves aleatórias cuja ordem reproduz a sequência de
+    # corte (lista de bins com os nomes dos tipos). O next-fit dessa ordem não usa mais
+    # bins que o plano de origem, pois cada bin do plano é um trecho contíguo dela.
+    itens_do_tipo = {
+        tipo: iter(np.flatnonzero(instancia.codigos == codigo).tolist())
+        for codigo, tipo in enumerate(instancia.tipos)
+    }
+    chaves = np.full(instancia.num_itens, np.nan)
+    posicao = 0
+    for bin in sequencia_de_corte:
+        for tipo in bin:
+            item = next(itens_do_tipo[tipo], None)
+            if item is None:
+                raise ValueError(f"A sequência de corte tem mais camisas {tipo} que a demanda")
+            chaves[item] = (posicao + 0.5) / instancia.num_itens
+            posicao += 1
+    if posicao != instancia.num_itens:
+        raise ValueError("A sequência de corte não cobre toda a demanda")
+    return chaves
+
+class FitnessCache:
+    # Cache limitado (LRU) de (sobra, num_bins), indexado pela sequência de tipos
+    # decodificada. Filhos que decodificam na mesma ordem de um indivíduo já visto
+    # não são empacotados de novo.
+    def __init__(self, maxsize=10_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._dados = OrderedDict()
+
+    def __len__(self):
+        return len(self._dados)
+
+    def get(self, chave):
+        valor = self._dados.get(chave)
+        if valor is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._dados.move_to_end(chave)
+        return valor
+
+    def put(self, chave, valor):
+        self._dados[chave] = valor
+        self._dados.move_to_end(chave)
+        if len(self._dados) > self.maxsize:
+            self._dados.popitem(last=False)
+
+def _next_fit_batch(sequencias, instancia):
+    # sequencias: matriz (num_individuos, n_genes) de códigos de tipo na ordem de corte.
+    # O next-fit percorre as posições com todas as linhas em paralelo. O estado de cada
+    # linha é o resíduo inteiro do bin aberto; as tabelas da instância dizem se o item
+    # cabe e qual o próximo resíduo, e a sobra de um bin fechado é o próprio resíduo.
+    num_individuos = sequencias.shape[0]
+    sobras = np.zeros(num_individuos, dtype=np.int64)
+    num_bins = np.zeros(num_individuos, dtype=np.int64)
+    if sequencias.shape[1] == 0:
+        return sobras / instancia.unidade, num_bins
+
+    num_tipos = len(instancia.tipos)
+    tabela_cabe = instancia.cabe.ravel()
+    tabela_residuo = instancia.proximo_residuo.ravel()
+    residuo = np.full(num_individuos, instancia.capacidade_int, dtype=np.int64)
+    for codigos in np.ascontiguousarray(sequencias.T):
+        indice = residuo * num_tipos + codigos
+        fecha = ~tabela_cabe[indice]
+        # Onde não cabe, fecha o bin atual e contabiliza a sobra
+        sobras += residuo * fecha
+        num_bins += fecha
+        residuo = tabela_residuo[indice]
+
+    # Fecha o último bin de cada indivíduo
+    sobras += residuo
+    num_bins += 1
+    return sobras / instancia.unidade, num_bins
+
+def _decode_sequencias(sequencias, instancia, decoder):
+    # sequencias: matriz (num_individuos, n_genes) de códigos de tipo na ordem de corte
+    if decoder == "next_fit":
+        return _next_fit_batch(sequencias, instancia)
+
+    # Estratégias por encaixe: uma linha por vez
+    empacotar = DECODERS[decoder]
+    tamanhos_tipo = instancia.tamanhos_tipo_int.tolist()
+    capacidade = instancia.capacidade_int
+    sobras = np.empty(len(sequencias), dtype=np.int64)
+    num_bins = np.empty(len(sequencias), dtype=np.int64)
+    for k, codigos in enumerate(sequencias.tolist()):
+        _, cargas = empacotar(codigos, tamanhos_tipo, capacidade)
+        sobras[k] = len(cargas) * capacidade - sum(cargas)
+        num_bins[k] = len(cargas)
+    return sobras / instancia.unidade, num_bins
+
+def decode_batch(population, instancia=INSTANCIA, cache=None, decoder=DECODER):
+    # Decodifica a população inteira de uma vez: um único argsort por linha e, no
+    # next-fit, o empacotamento de todas as linhas em paralelo.
+    # Retorna (sobras, num_bins), um valor por indivíduo, iguais aos de decode()
+    if decoder == DECODER_PADROES:
+        return decode_padroes_batch(population, instancia)
+    ordem = np.argsort(population, axis=1, kind="stable")
+    sequencias = instancia.codigos[ordem]
+    if cache is None:
+        return _decode_sequencias(sequencias, instancia, decoder)
+
+    # Com cache: a chave é a sequência de códigos de tipo na ordem de corte
+    chaves = [linha.tobytes() for linha in sequencias]
+    sobras = np.empty(len(chaves))
+    num_bins = np.empty(len(chaves), dtype=np.int64)
+    faltando = []
+    for k, chave in enumerate(chaves):
+        valor = cache.get(chave)
+        if valor is None:
+            faltando.append(k)
+        else:
+            sobras[k], num_bins[k] = valor
+
+    if faltando:
+        sobras_novas, bins_novos = _decode_sequencias(sequencias[faltando], instancia, decoder)
+        sobras[faltando] = sobras_novas
+        num_bins[faltando] = bins_novos
+        for k, sobra, nb in zip(faltando, sobras_novas.tolist(), bins_novos.tolist()):
+            cache.put(chaves[k], (sobra, nb))
+
+    return sobras, num_bins
+
+def fitness_batch(population, instancia=INSTANCIA, cache=None, decoder=DECODER):
+    sobras, _ = decode_batch(population, instancia, cache, decoder)
+    return sobras
+
+# ========= DECODIFICAÇÃO INCREMENTAL =========
+
+class _LinhaDecodificada:
+    # Um indivíduo já avaliado: sequência de tipos (chave), a referência de onde retomou
+    # o next-fit e a posição k da retomada. O estado por prefixo (somas, bins, sobras),
+    # com n+1 entradas (estado depois de j itens), só é montado se ele virar elite.
+    __slots__ = ("chave", "codigos", "referencia", "k", "estado")
+
+    def __init__(self, chave, codigos, referencia, k):
+        self.chave = chave
+        self.codigos = codigos
+        self.referencia = referencia
+        self.k = k
+        self.estado = None
+
+class DecodificadorIncremental:
+    # Next-fit incremental. Guarda o estado por prefixo das elites e, para cada novo
+    # indivíduo, retoma do primeiro ponto em que sua sequência de tipos difere da elite
+    # mais parecida (o maior prefixo em comum está entre as vizinhas na ordem
+    # lexicográfica), em vez de reempacotar os n itens. Resultados iguais aos de decode().
+    def __init__(self, instancia):
+        self.instancia = instancia
+        self.tamanhos_tipo = instancia.tamanhos_tipo_int.tolist()
+        self.capacidade = instancia.capacidade_int
+        self.unidade = instancia.unidade
+        self.posicoes_reaproveitadas = 0
+        self.posicoes_totais = 0
+        self.reiniciar()
+
+    def reiniciar(self):
+        self._linhas = []         # alinhadas com as linhas da população atual
+        self._referencias = []    # elites ordenadas pela chave
+        self._chaves = []
+
+    def _retomar(self, codigos, k, estado, registrar):
+        # Next-fit a partir do estado depois de k itens; opcionalmente registra o estado de cada prefixo
+        somas, bins, sobras = estado
+        current_sum, fechados, sobra = somas[k], bins[k], sobras[k]
+        capacidade = self.capacidade
+        tamanhos_tipo = self.tamanhos_tipo
+        if registrar:
+            somas, bins, sobras = somas[:k + 1], bins[:k + 1], sobras[:k + 1]
+        for codigo in codigos[k:]:
+            size = tamanhos_tipo[codigo]
+            nova_soma = current_sum + size
+            if nova_soma <= capacidade:
+                current_sum = nova_soma
+            else:
+                fechados += 1
+                sobra += capacidade - current_sum
+                current_sum = size
+            if registrar:
+                somas.append(current_sum)
+                bins.append(fechados)
+                sobras.append(sobra)
+        if registrar:
+            return somas, bins, sobras
+        return current_sum, fechados, sobra
+
+    def decode_batch(self, population):
+        # Avalia as novas linhas da população (as que vêm depois das elites já guardadas)
+        num_itens = self.instancia.num_itens
+        sequencias = self.instancia.codigos[np.argsort(population, axis=1, kind="stable")]
+        sobras = np.empty(len(sequencias))
+        num_bins = np.empty(len(sequencias), dtype=np.int64)
+        vazio = ([0], [0], [0])
+
+        for linha, seq in enumerate(sequencias):
+            chave = seq.tobytes()
+            referencia, k = None, 0
+            pos = bisect.bisect_left(self._chaves, chave)
+            for vizinha in self._referencias[max(0, pos - 1):pos + 1]:
+                diferentes = np.frombuffer(vizinha.chave, dtype=np.int8) != seq
+                k_vizinha = int(diferentes.argmax()) if diferentes.any() else num_itens
+                if referencia is None or k_vizinha > k:
+                    referencia, k = vizinha, k_vizinha
+
+            codigos = seq.tolist()
+            estado = vazio if referencia is None else referencia.estado
+            current_sum, fechados, sobra = self._retomar(codigos, k, estado, registrar=False)
+            if num_itens:
+                fechados += 1
+                sobra += self.capacidade - current_sum
+            sobras[linha] = sobra / self.unidade
+            num_bins[linha] = fechados
+
+            self._linhas.append(_LinhaDecodificada(chave, codigos, referencia, k))
+            self.posicoes_reaproveitadas += k
+            self.posicoes_totais += num_itens
+
+        return sobras, num_bins
+
+    def substituir(self, indice, individuo):
+        # Linha alterada fora do GA (ex.: busca local): perde a referência e, se
+        # virar elite, tem o estado por prefixo montado do zero
+        seq = self.instancia.codigos[np.argsort(individuo, kind="stable")]
+        self._linhas[indice] = _LinhaDecodificada(seq.tobytes(), seq.tolist(), None, 0)
+
+    def selecionar(self, indices):
+        # Mantém só as linhas escolhidas como elites (na ordem da nova população)
+        # e monta o estado por prefixo das que ainda não o têm
+        elites = [self._linhas[i] for i in indices]
+        for linha in elites:
+            if linha.estado is None:
+                estado = ([0], [0], [0]) if linha.referencia is None else linha.referencia.estado
+                linha.estado = self._retomar(linha.codigos, linha.k, estado, registrar=True)
+                linha.referencia = None
+        self._linhas = elites
+        self._referencias = sorted(elites, key=lambda linha: linha.chave)
+        self._chaves = [linha.chave for linha in self._referencias]
@@ -0,0 +1,159 @@
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+import numpy as np
+
+from .decoders import decode, fitness, fitness_batch
+from .experimentos import PASTA_RESULTADOS
+from .ga import biased_crossover, proxima_geracao, random_individual, random_population, ranquear
+from .instancia import Instance
+from .parametros import (
+    BIN_CAPACITY, CAMISA_COUNTS, DECODER, ELITE_FRAC, INHERIT_PROB, ITEM_TYPES, MUTANT_FRAC, n,
+)
+
+# ========= SUÍTE DE DESEMPENHO =========
+# Mede a vazão (chamadas por segundo) dos caminhos quentes do GA com sementes
+# fixas, em instâncias de tamanhos diferentes (o n de parametros.py) e com
+# populações diferentes. Cada execução vira um JSON em brkga_resultados/desempenho;
+# uma delas, promovida a linha de base, serve de referência para o comparar(),
+# que aponta as operações que ficaram mais lentas que a tolerância.
+
+PASTA_DESEMPENHO = os.path.join(PASTA_RESULTADOS, "desempenho")
+LINHA_DE_BASE = os.path.join(PASTA_DESEMPENHO, "linha_de_base.json")
+TAMANHOS_PADRAO = (10, 100, 1000)
+POPS_PADRAO = (100, 1000)
+TOLERANCIA_PADRAO = 0.10   # queda de vazão aceita antes de acusar regressão
+
+def instancia_escalada(n_escala, item_types=ITEM_TYPES, bin_capacity=BIN_CAPACITY):
+    # Mesma proporção entre os tamanhos de CAMISA_COUNTS, com n_escala no lugar de n
+    return Instance.build(item_types, {tipo: qtd // n * n_escala for tipo, qtd in CAMISA_COUNTS.items()},
+                          bin_capacity)
+
+def _cronometrar(funcao, tempo_min, rodadas=5):
+    # Calibra quantas chamadas cabem numa rodada de tempo_min / rodadas segundos e
+    # devolve o menor tempo por chamada entre as rodadas (o menos perturbado).
+    # Operações lentas, com uma chamada maior que a rodada, param em 2 * tempo_min
+    alvo = tempo_min / rodadas
+    chamadas = 1
+    gasto = 0.0
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        duracao = time.perf_counter() - inicio
+        gasto += duracao
+        if duracao >= alvo:
+            break
+        chamadas *= 2 if duracao == 0 else max(2, min(10, int(alvo / duracao) + 1))
+    melhor = duracao / chamadas
+    for _ in range(rodadas - 1):
+        if gasto >= 2 * tempo_min:
+            break
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        duracao = time.perf_counter() - inicio
+        gasto += duracao
+        melhor = min(melhor, duracao / chamadas)
+    return melhor
+
+def _casos_individuo(instancia, decoder, rng):
+    individuo = np.asarray(random_individual(instancia, rng))
+    elite = random_individual(instancia, rng)
+    nao_elite = random_individual(instancia, rng)
+    return {
+        "random_individual": lambda: random_individual(instancia, rng),
+        "decode": lambda: decode(individuo, instancia, decoder),
+        "fitness": lambda: fitness(individuo, instancia, decoder),
+        "biased_crossover": lambda: biased_crossover(elite, nao_elite, INHERIT_PROB, rng),
+    }
+
+def _casos_populacao(instancia, pop_size, decoder, rng):
+    population = random_population(pop_size, instancia.num_itens, rng)
+    elite_size = int(pop_size * ELITE_FRAC)
+    mutant_size = int(pop_size * MUTANT_FRAC)
+    estado = [population]
+
+    def geracao():
+        # Um passo completo: avaliação, ordenação e nova geração
+        desperdicios = fitness_batch(estado[0], instancia, None, decoder)
+        estado[0] = proxima_geracao(
+            estado[0], ranquear(desperdicios, elite_size), elite_size, mutant_size, INHERIT_PROB, rng
+        )
+
+    return {
+        "fitness_batch": lambda: fitness_batch(population, instancia, None, decoder),
+        "geracao": geracao,
+    }
+
+def executar_suite(tamanhos=TAMANHOS_PADRAO, pop_sizes=POPS_PADRAO, tempo_min=0.5, semente=0, decoder=DECODER):
+    # Retorna {"meta": {...}, "resultados": {chave: medida}}; cada caso começa com
+    # um gerador novo a partir da mesma semente
+    resultados = {}
+    for n_escala in tamanhos:
+        instancia = instancia_escalada(n_escala)
+        casos = [({"n": n_escala}, _casos_individuo(instancia, decoder, np.random.default_rng(semente)))]
+        for pop_size in pop_sizes:
+            casos.append(({"n": n_escala, "pop_size": pop_size},
+                          _casos_populacao(instancia, pop_size, decoder, np.random.default_rng(semente))))
+        for rotulos, funcoes in casos:
+            for operacao, funcao in funcoes.items():
+                segundos = _cronometrar(funcao, tempo_min)
+                chave = "|".join([operacao] + [f"{nome}={valor}" for nome, valor in rotulos.items()])
+                resultados[chave] = {
+                    "operacao": operacao, **rotulos, "itens": instancia.num_itens,
+                    "segundos_por_chamada": segundos, "por_segundo": 1 / segundos,
+                }
+    meta = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "maquina": platform.platform(),
+        "decoder": decoder,
+        "semente": semente,
+        "tempo_min": tempo_min,
+    }
+    return {"meta": meta, "resultados": resultados}
+
+def salvar_desempenho(medicao, caminho=None):
+    # Sem caminho, grava com timestamp em PASTA_DESEMPENHO. Retorna o caminho usado
+    if caminho is None:
+        caminho = os.path.join(PASTA_DESEMPENHO, f"desempenho_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(medicao, arquivo, indent=1)
+    return caminho
+
+def carregar_desempenho(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+def comparar(base, atual, tolerancia=TOLERANCIA_PADRAO):
+    # Compara as chaves presentes nas duas medições. Retorna uma lista de
+    # (chave, vazao_base, vazao_atual, razao, regressao), com regressao quando a
+    # vazão atual caiu mais que a tolerância
+    comparacao = []
+    for chave, medida in atual["resultados"].items():
+        if chave not in base["resultados"]:
+            continue
+        vazao_base = base["resultados"][chave]["por_segundo"]
+        razao = medida["por_segundo"] / vazao_base
+        comparacao.append((chave, vazao_base, medida["por_segundo"], razao, razao < 1 - tolerancia))
+    return comparacao
+
+def relatorio_comparacao(comparacao):
+    linhas = [f"{'operação':<36} {'base/s':>12} {'atual/s':>12} {'razão':>7}"]
+    for chave, vazao_base, vazao_atual, razao, regressao in comparacao:
+        marca = "  REGRESSÃO" if regressao else ""
+        linhas.append(f"{chave:<36} {vazao_base:12.1f} {vazao_atual:12.1f} {razao:7.2f}{marca}")
+    return "\n".join(linhas)
+
+def relatorio_desempenho(medicao):
+    linhas = [f"{'operação':<36} {'itens':>7} {'chamadas/s':>12} {'ms/chamada':>11}"]
+    for chave, medida in medicao["resultados"].items():
+        linhas.append(f"{chave:<36} {medida['itens']:7d} {medida['por_segundo']:12.1f} "
+                      f"{1000 * medida['segundos_por_chamada']:11.3f}")
+    return "\n".join(linhas)
@@ -0,0 +1,280 @@
+import csv
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+
+from .armazem import ArmazemResultados
+from .convergencia import RegistroConvergencia, carregar_convergencia
+from .ga import brgka_simples
+from .instancia import INSTANCIA
+from .parametros import DECODER, ELITE_FRAC, INHERIT_PROB, MUTANT_FRAC, POP_SIZE
+
+# ========= EXPERIMENTOS EM LOTE =========
+
+PARAMETROS_PADRAO = {
+    "pop_size": POP_SIZE,
+    "elite_frac": ELITE_FRAC,
+    "mutant_frac": MUTANT_FRAC,
+    "inherit_prob": INHERIT_PROB,
+    "decoder": DECODER,
+}
+
+def _executar_job(n_geracoes, parametros, semente, instancia, arquivo_convergencia=None):
+    # Cada job é independente: gerador próprio a partir da sua semente.
+    # Com arquivo_convergencia, o melhor de cada geração vai para o CSV durante a execução
+    inicio = time.time()
+    with RegistroConvergencia(arquivo_convergencia) as convergencia:
+        num_bins, desperdicio, sequencia_camisas, motivo_parada = brgka_simples(
+            n_geracoes, instancia=instancia, semente=semente,
+            observadores=[convergencia] if arquivo_convergencia is not None else None, **parametros
+        )
+    duracao = time.time() - inicio
+    return duracao, desperdicio, num_bins, sequencia_camisas, motivo_parada
+
+def executar_experimentos(num_geracoes, num_repeticoes, grade_parametros=None, max_workers=None,
+                          semente=None, instancia=INSTANCIA, csv_filename=None, pasta_convergencia=None,
+                          armazem=None):
+    # Roda a grade (parâmetros x gerações x repetições) com um job por processo.
+    # Retorna (resultados_individuais, resultados_medios) no formato usado pelo CSV
+    # e pelo gráfico, na ordem da grade, com médias por (parâmetros, gerações).
+    # Cada job recebe uma semente derivada de semente por SeedSequence.spawn, gravada
+    # no resultado: brgka_simples(..., semente=Semente) refaz aquela linha.
+    # csv_filename: cada linha é anexada ao CSV assim que o job termina.
+    # pasta_convergencia: um CSV de convergência por job (job_<k>.csv), escrito durante o job.
+    # armazem: ArmazemResultados onde cada execução é anexada assim que o job termina.
+    if grade_parametros is None:
+        grade_parametros = [PARAMETROS_PADRAO]
+    jobs = [
+        (indice, n_geracoes, rep, parametros)
+        for indice, parametros in enumerate(grade_parametros)
+        for n_geracoes in num_geracoes
+        for rep in range(num_repeticoes)
+    ]
+    sementes = [int(seq.generate_state(1)[0]) for seq in np.random.SeedSequence(semente).spawn(len(jobs))]
+    arquivos_convergencia = [None] * len(jobs)
+    if pasta_convergencia is not None:
+        os.makedirs(pasta_convergencia, exist_ok=True)
+        arquivos_convergencia = [os.path.join(pasta_convergencia, f"job_{k}.csv") for k in range(len(jobs))]
+
+    resultados_individuais = [None] * len(jobs)
+    arquivo_csv = None
+    if csv_filename is not None:
+        arquivo_csv = open(csv_filename, mode="w", newline='', encoding='utf-8')
+        writer = csv.writer(arquivo_csv)
+        writer.writerow(CABECALHO_CSV)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futuros = {
+                executor.submit(
+                    _executar_job, n_geracoes, parametros, sementes[k], instancia, arquivos_convergencia[k]
+                ): k
+                for k, (_, n_geracoes, _, parametros) in enumerate(jobs)
+            }
+            for futuro in as_completed(futuros):
+                k = futuros[futuro]
+                duracao, desperdicio, num_bins, sequencia_camisas, motivo_parada = futuro.result()
+                _, n_geracoes, rep, parametros = jobs[k]
+                resultados_individuais[k] = (
+                    n_geracoes, duracao, desperdicio, rep + 1,
+                    num_bins, sequencia_camisas, motivo_parada, sementes[k], texto_parametros(parametros)
+                )
+                if arquivo_csv is not None:
+                    writer.writerow(resultados_individuais[k])
+                    arquivo_csv.flush()
+                if armazem is not None:
+                    armazem.adicionar(instancia, parametros, n_geracoes, sementes[k], rep + 1, duracao,
+                                      desperdicio, num_bins, sequencia_camisas, motivo_parada)
+                print(f"  {n_geracoes} gerações, execução {rep + 1}/{num_repeticoes}: "
+                      f"{desperdicio:.2f}m em {duracao:.1f}s (parada: {motivo_parada})")
+    finally:
+        if arquivo_csv is not None:
+            arquivo_csv.close()
+
+    return resultados_individuais, _medias(resultados_individuais)
+
+# ========= SALVAR E PLOTAR =========
+
+PASTA_RESULTADOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "brkga_resultados")
+ARMAZEM_PADRAO = os.path.join(PASTA_RESULTADOS, "resultados")   # resultados.idx/.dat/.cat.jsonl
+CABECALHO_CSV = [
+    "Geracoes", "Tempo_execucao_s", "Desperdicio_m", "Repeticao", "Num_Bins", "Melhor_Solucao",
+    "Motivo_Parada", "Semente", "Parametros"
+]
+CORES_GRAFICO = ['royalblue', 'darkorange', 'seagreen', 'firebrick', 'purple']
+
+def texto_parametros(parametros):
+    # Coluna Parametros do CSV: o conjunto de parâmetros da linha, em JSON canônico
+    return json.dumps(parametros, sort_keys=True)
+
+def _medias(resultados_individuais):
+    # Médias de tempo e desperdício por (conjunto de parâmetros, gerações), na ordem
+    # em que os grupos aparecem: (n_geracoes, tempo_medio, desperdicio_medio, parametros)
+    grupos = {}
+    for n_geracoes, duracao, desperdicio, _, _, _, _, _, parametros in resultados_individuais:
+        grupos.setdefault((parametros, n_geracoes), []).append((duracao, desperdicio))
+    return [
+        (n_geracoes,
+         sum(duracao for duracao, _ in valores) / len(valores),
+         sum(desperdicio for _, desperdicio in valores) / len(valores),
+         parametros)
+        for (parametros, n_geracoes), valores in grupos.items()
+    ]
+
+def salvar_csv(resultados_individuais, csv_filename):
+    try:
+        with open(csv_filename, mode="w", newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(CABECALHO_CSV)
+            for linha in resultados_individuais:
+                writer.writerow(linha)
+        print(f"CSV salvo como: {csv_filename}")
+    except Exception:
+        print("Erro ao salvar CSV:")
+        traceback.print_exc()
+
+def carregar_csv(csv_filename):
+    # Lê um CSV de resultados (inclusive os antigos, sem Motivo_Parada, Semente ou
+    # Parametros) e refaz as médias por conjunto de parâmetros e quantidade de gerações
+    resultados_individuais = []
+    with open(csv_filename, newline='', encoding='utf-8') as file:
+        for linha in csv.DictReader(file):
+            resultados_individuais.append((
+                int(linha["Geracoes"]), float(linha["Tempo_execucao_s"]), float(linha["Desperdicio_m"]),
+                int(linha["Repeticao"]), int(linha["Num_Bins"]), linha["Melhor_Solucao"],
+                linha.get("Motivo_Parada", ""), linha.get("Semente", ""), linha.get("Parametros", ""),
+            ))
+    return resultados_individuais, _medias(resultados_individuais)
+
+def _rotulos_medias(conjuntos):
+    # Legenda de cada linha de média: só os parâmetros que mudam entre os conjuntos
+    if len(conjuntos) <= 1:
+        return {conjunto: "Média" for conjunto in conjuntos}
+    dicionarios = {conjunto: json.loads(conjunto) if conjunto else {} for conjunto in conjuntos}
+    chaves = sorted({chave for d in dicionarios.values() for chave in d})
+    variaveis = [chave for chave in chaves if len({repr(d.get(chave)) for d in dicionarios.values()}) > 1]
+    return {
+        conjunto: "Média " + ", ".join(f"{chave}={d.get(chave)}" for chave in variaveis)
+        for conjunto, d in dicionarios.items()
+    }
+
+def plotar_resultados(resultados_individuais, resultados_medios, png_filename=None, mostrar=True):
+    # matplotlib só é carregado aqui, para não pesar na importação do solver
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    desps_individuais = [desp for (_, _, desp, *_) in resultados_individuais]
+    desps_medios = [r[2] for r in resultados_medios]
+    desps_unicos = sorted(set(desps_individuais + desps_medios))
+
+    labels_usados = set()
+    for ger, tempo, desp, rep, num_bins, *_ in resultados_individuais:
+        label = f'{ger}g - rep {rep}'
+        cor = CORES_GRAFICO[rep % len(CORES_GRAFICO)]
+        if label not in labels_usados:
+            plt.plot(tempo, desp, 'o', color=cor, label=label)
+            labels_usados.add(label)
+        else:
+            plt.plot(tempo, desp, 'o', color=cor)
+
+        # Mostra número de bins ao lado do ponto
+        plt.annotate(f"{num_bins}", xy=(tempo, desp), xytext=(5, 0),
+                     textcoords="offset points", ha='left', va='center', fontsize=8)
+
+    # Uma linha de média por conjunto de parâmetros
+    conjuntos = list(dict.fromkeys(r[3] for r in resultados_medios))
+    rotulos = _rotulos_medias(conjuntos)
+    estilos = ['-o', '--s', ':^', '-.d']
+    for k, conjunto in enumerate(conjuntos):
+        medias = [r for r in resultados_medios if r[3] == conjunto]
+        plt.plot([r[1] for r in medias], [r[2] for r in medias], estilos[k % len(estilos)], color='black',
+                 linewidth=2, label=rotulos[conjunto])
+
+    plt.yticks(desps_unicos, [f'{v:.2f}' for v in desps_unicos])
+    plt.title("BRKGA - Desperdício por Execução e Média")
+    plt.xlabel("Tempo de execução (s)")
+    plt.ylabel("Desperdício final (m)")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+
+    # Salvar imagem
+    if png_filename is not None:
+        try:
+            plt.savefig(png_filename, dpi=300)
+            print(f"Imagem salva como: {png_filename}")
+        except Exception:
+            print("Erro ao salvar imagem:")
+            traceback.print_exc()
+
+    if mostrar:
+        plt.show()
+
+def plotar_convergencia(arquivos_convergencia, png_filename=None, mostrar=True):
+    # Uma curva por CSV de convergência (veja brkga.convergencia)
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    for k, arquivo in enumerate(arquivos_convergencia):
+        geracoes, desperdicios = carregar_convergencia(arquivo)
+        plt.plot(geracoes, desperdicios, drawstyle="steps-post", color=CORES_GRAFICO[k % len(CORES_GRAFICO)],
+                 label=os.path.splitext(os.path.basename(arquivo))[0])
+
+    plt.title("BRKGA - Convergência do Melhor Desperdício")
+    plt.xlabel("Geração")
+    plt.ylabel("Melhor desperdício da geração (m)")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+
+    if png_filename is not None:
+        try:
+            plt.savefig(png_filename, dpi=300)
+            print(f"Imagem salva como: {png_filename}")
+        except Exception:
+            print("Erro ao salvar imagem:")
+            traceback.print_exc()
+
+    if mostrar:
+        plt.show()
+
+# ========= TESTES DE PERFORMANCE =========
+
+def executar_benchmark(num_geracoes, num_repeticoes, max_workers=None, semente=None, instancia=INSTANCIA,
+                       grade_parametros=None, output_dir=PASTA_RESULTADOS, plotar=True, mostrar=True,
+                       convergencia=False):
+    print(f"Vamos rodar o problema {num_repeticoes}x. Estas serão as quantidades de gerações:")
+    print(num_geracoes)
+    print(f"Instância: {instancia.num_itens} camisas, limite inferior de {instancia.limite_inferior_bins} bins "
+          f"({instancia.limite_inferior_desperdicio:.2f}m de desperdício)")
+
+    # Arquivos com timestamp, escritos à medida que os jobs terminam
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_filename = os.path.join(output_dir, f"resultados_{timestamp}.csv")
+    png_filename = os.path.join(output_dir, f"grafico_{timestamp}.png")
+    pasta_convergencia = os.path.join(output_dir, f"convergencia_{timestamp}") if convergencia else None
+
+    # Repetições e quantidades de gerações são independentes: rodam em paralelo.
+    # Toda execução também vai para o armazém binário da pasta
+    resultados_individuais, resultados_medios = executar_experimentos(
+        num_geracoes, num_repeticoes, grade_parametros, max_workers=max_workers, semente=semente,
+        instancia=instancia, csv_filename=csv_filename, pasta_convergencia=pasta_convergencia,
+        armazem=ArmazemResultados(os.path.join(output_dir, "resultados")),
+    )
+    print(f"CSV salvo como: {csv_filename}")
+
+    if plotar:
+        # O gráfico sai do CSV gravado, o mesmo caminho do subcomando plot
+        plotar_resultados(*carregar_csv(csv_filename), png_filename, mostrar)
+        if pasta_convergencia is not None:
+            arquivos = sorted(
+                (os.path.join(pasta_convergencia, nome) for nome in os.listdir(pasta_convergencia)),
+                key=lambda caminho: int(os.path.basename(caminho)[4:-4]),
+            )
+            plotar_convergencia(arquivos, os.path.join(output_dir, f"convergencia_{timestamp}.png"), mostrar)
+    return resultados_individuais, resultados_medios
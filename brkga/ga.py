@@ -0,0 +1,253 @@
+import os
+import time
+
+import numpy as np
+
+from .busca_local import aplicar_busca_local
+from .checkpoint import Checkpoint, carregar_checkpoint, salvar_checkpoint
+from .decoders import DecodificadorIncremental, FitnessCache, decode, fitness_batch, num_genes
+from .instancia import INSTANCIA
+from .instrumentacao import Medidor
+from .paralelo import AvaliadorParalelo
+from .parametros import (
+    CACHE_SIZE, DECODE_INCREMENTAL, DECODER, ELITES_BUSCA_LOCAL, INHERIT_PROB, INTERVALO_BUSCA_LOCAL,
+    INTERVALO_CHECKPOINT, MAX_ESTAGNACAO, NUM_WORKERS, PARAR_NO_OTIMO, REINICIAR_NA_ESTAGNACAO, TEMPO_LIMITE,
+)
+
+# ========= FUNÇÕES DO ALG. GENÉTICO  =========
+# Toda a aleatoriedade vem de um np.random.Generator explícito (rng). Onde o
+# parâmetro aceita None, um inteiro ou uma SeedSequence, np.random.default_rng
+# cria o gerador; um Generator passado é usado como está.
+
+def random_individual(instancia=INSTANCIA, rng=None):
+    # Gera um vetor de R^n onde cada componente pertece à [0,1]
+    rng = np.random.default_rng(rng)
+    return rng.random(instancia.num_itens).tolist()
+
+def random_population(pop_size, tamanho, rng=None):
+    # Gera a população inteira de uma vez: matriz (pop_size, n_genes) com genes em [0,1)
+    rng = np.random.default_rng(rng)
+    return rng.random((pop_size, tamanho))
+
+def avaliar_populacao(population, desperdicios_elite, instancia=INSTANCIA, cache=None, avaliador=None,
+                      incremental=None, decoder=DECODER):
+    # As primeiras linhas são elites copiadas sem alteração da geração anterior:
+    # o fitness delas vem junto (desperdicios_elite) e só o resto é avaliado.
+    # Com um AvaliadorParalelo a decodificação vai para o pool; com um
+    # DecodificadorIncremental, retoma do prefixo em comum (ambos sem cache)
+    num_elites = 0 if desperdicios_elite is None else len(desperdicios_elite)
+    if avaliador is not None:
+        novos = avaliador.fitness_batch(population[num_elites:])
+    elif incremental is not None:
+        novos, _ = incremental.decode_batch(population[num_elites:])
+    else:
+        novos = fitness_batch(population[num_elites:], instancia, cache, decoder)
+    if desperdicios_elite is None:
+        return novos
+    return np.concatenate((desperdicios_elite, novos))
+
+def biased_crossover(elite, non_elite, inherit_prob=INHERIT_PROB, rng=None):
+    # Crossover clássico gene a gene, com a máscara sorteada de uma vez
+    rng = np.random.default_rng(rng)
+    mascara = (rng.random(len(elite)) < inherit_prob).tolist()
+    return [e_gene if herda else n_gene for e_gene, n_gene, herda in zip(elite, non_elite, mascara)]
+
+def biased_crossover_batch(elites, non_elites, inherit_prob=INHERIT_PROB, rng=None):
+    # Crossover enviesado do lote inteiro: uma única máscara sorteada decide,
+    # gene a gene e linha a linha, se o gene vem do pai elite ou do não-elite
+    rng = np.random.default_rng(rng)
+    mascara = rng.random(elites.shape) < inherit_prob
+    return np.where(mascara, elites, non_elites)
+
+def ranquear(desperdicios, num_melhores):
+    # Ordem das linhas para a próxima geração sem ordenar a população inteira:
+    # as num_melhores primeiras são as de menor desperdício, em ordem (empates pela
+    # linha); o resto, sem ordem entre si, é o grupo dos não-elites. O argpartition
+    # é O(P), e só as num_melhores passam por argsort.
+    pop_size = len(desperdicios)
+    if num_melhores >= pop_size:
+        return np.argsort(desperdicios, kind="stable")
+    if num_melhores <= 0:
+        return np.arange(pop_size)
+    particao = np.argpartition(desperdicios, num_melhores - 1)
+    melhores = np.sort(particao[:num_melhores])
+    particao[:num_melhores] = melhores[np.argsort(desperdicios[melhores], kind="stable")]
+    return particao
+
+def proxima_geracao(population, ordem, elite_size, mutant_size, inherit_prob, rng=None, medidor=None):
+    # population: matriz (pop_size, n_genes) da geração atual
+    # ordem: índices das linhas com as elite_size melhores primeiro (veja ranquear);
+    # ordem[elite_size:] é o grupo dos não-elites
+    # medidor: Medidor do brgka_simples; separa as fases "mutantes" e "crossover"
+    rng = np.random.default_rng(rng)
+    pop_size, tamanho = population.shape
+    num_filhos = pop_size - elite_size - mutant_size
+
+    new_pop = np.empty_like(population)
+    # Elites copiadas por índice de linha
+    new_pop[:elite_size] = population[ordem[:elite_size]]
+    if medidor is not None:
+        medidor.marcar("nova_geracao")
+    # Mutantes sorteados numa chamada só
+    new_pop[elite_size:elite_size + mutant_size] = random_population(mutant_size, tamanho, rng)
+    if medidor is not None:
+        medidor.marcar("mutantes")
+    # Filhos: pai elite da nova população, pai não-elite sorteado entre os índices de
+    # ordem[elite_size:] (a população anterior não está ordenada)
+    if num_filhos > 0:
+        pais_elite = new_pop[rng.integers(0, elite_size, num_filhos)]
+        pais_nao_elite = population[ordem[rng.integers(elite_size, pop_size, num_filhos)]]
+        new_pop[elite_size + mutant_size:] = biased_crossover_batch(
+            pais_elite, pais_nao_elite, inherit_prob, rng
+        )
+    if medidor is not None:
+        medidor.marcar("crossover")
+
+    return new_pop
+
+# ========= ALGORITMO PRINCIPAL =========
+
+def brgka_simples(num_geracoes, pop_size, elite_frac, mutant_frac, inherit_prob, instancia=INSTANCIA,
+                  cache_size=CACHE_SIZE, num_workers=NUM_WORKERS,
+                  tempo_limite=TEMPO_LIMITE, max_estagnacao=MAX_ESTAGNACAO,
+                  reiniciar_na_estagnacao=REINICIAR_NA_ESTAGNACAO, parar_no_otimo=PARAR_NO_OTIMO,
+                  decode_incremental=DECODE_INCREMENTAL, decoder=DECODER,
+                  populacao_inicial=None, limite_inferior=None,
+                  arquivo_checkpoint=None, intervalo_checkpoint=INTERVALO_CHECKPOINT, retomar=False,
+                  semente=None, observadores=None,
+                  intervalo_busca_local=INTERVALO_BUSCA_LOCAL, elites_busca_local=ELITES_BUSCA_LOCAL):
+    # Retorna (num_bins, desperdicio, sequencia_de_corte, motivo_parada), com motivo_parada em
+    # "geracoes" (rodou todas), "tempo", "estagnacao" ou "otimo" (atingiu o limite inferior)
+    # populacao_inicial: indivíduos (linhas) que entram no lugar dos primeiros sorteados.
+    # limite_inferior: limite de desperdício mais forte que o da instância (ex.: limite_inferior_lp)
+    # arquivo_checkpoint: grava o estado a cada intervalo_checkpoint gerações; com retomar=True
+    # e o arquivo existente, continua de onde parou (população, gerações, melhor e RNG)
+    # semente: inteiro, SeedSequence ou Generator; a mesma semente reproduz a execução
+    # observadores: chamáveis que recebem as métricas de cada geração (veja brkga.instrumentacao)
+    # intervalo_busca_local: a cada tantas gerações, as elites_busca_local melhores passam
+    # pela busca local nas bins (veja brkga.busca_local), com as chaves reescritas
+    
+    if num_geracoes < 1:
+        raise ValueError(f"num_geracoes deve ser pelo menos 1, recebeu {num_geracoes}")
+    rng = np.random.default_rng(semente)
+    population = random_population(pop_size, num_genes(instancia, decoder), rng)
+    if populacao_inicial is not None and len(populacao_inicial):
+        sementes = np.asarray(populacao_inicial)[:pop_size]
+        population[:len(sementes)] = sementes
+    desperdicios = None
+    cache = FitnessCache(cache_size) if cache_size else None
+    # Modo paralelo (opcional): o pool vive durante toda a execução
+    avaliador = AvaliadorParalelo(instancia, pop_size, num_workers, decoder) if num_workers > 1 else None
+    # A retomada por prefixo só vale para o next-fit, cujo estado é um único bin aberto
+    usar_incremental = decode_incremental and avaliador is None and decoder == "next_fit"
+    incremental = DecodificadorIncremental(instancia) if usar_incremental else None
+    elite_size = int(elite_frac * pop_size)
+    mutant_size = int(mutant_frac * pop_size)
+    # Linhas que precisam sair em ordem: as elites e as que passam pela busca local
+    num_ranqueados = max(elite_size, elites_busca_local if intervalo_busca_local else 1)
+    medidor = Medidor(observadores, cache, incremental) if observadores else None
+
+    melhor_individuo = None
+    melhor_desperdicio = float("inf")
+
+    inicio = time.time()
+    geracao_inicial = 0
+    ultima_melhoria = 0
+    motivo_parada = "geracoes"
+    if retomar and arquivo_checkpoint is not None and os.path.exists(arquivo_checkpoint):
+        estado = carregar_checkpoint(arquivo_checkpoint)
+        if estado.population.shape != population.shape or estado.decoder != decoder:
+            raise ValueError(f"Checkpoint {arquivo_checkpoint} não corresponde a esta configuração")
+        # As elites são reavaliadas na primeira geração retomada: o checkpoint não guarda fitness
+        population = estado.population
+        geracao_inicial = estado.geracao
+        ultima_melhoria = estado.ultima_melhoria
+        melhor_individuo = estado.melhor_individuo
+        melhor_desperdicio = estado.melhor_desperdicio
+        inicio -= estado.tempo_decorrido
+        rng.bit_generator.state = estado.estado_rng
+    # Tolerância para a comparação em ponto flutuante com o limite inferior
+    if limite_inferior is None:
+        limite_inferior = instancia.limite_inferior_desperdicio
+    limite_inferior = max(limite_inferior, instancia.limite_inferior_desperdicio) + 1e-9
+
+    try:
+        for geracao in range(geracao_inicial, num_geracoes):
+            if medidor is not None:
+                medidor.iniciar_geracao(geracao)
+            # Avaliar população (só mutantes e filhos; elites trazem o fitness)
+            avaliacoes = pop_size if desperdicios is None else pop_size - len(desperdicios)
+            desperdicios = avaliar_populacao(
+                population, desperdicios, instancia, cache, avaliador, incremental, decoder
+            )
+            if medidor is not None:
+                medidor.marcar("avaliacao")
+            ordem = ranquear(desperdicios, num_ranqueados)
+            if intervalo_busca_local and geracao % intervalo_busca_local == intervalo_busca_local - 1:
+                if medidor is not None:
+                    medidor.marcar("ordenacao")
+                if aplicar_busca_local(population, desperdicios, ordem[:elites_busca_local], instancia, decoder,
+                                       incremental):
+                    ordem = ranquear(desperdicios, num_ranqueados)
+                if medidor is not None:
+                    medidor.marcar("busca_local")
+
+            desperdicio_atual = desperdicios[ordem[0]]
+
+            if desperdicio_atual < melhor_desperdicio:
+                melhor_desperdicio = desperdicio_atual
+                melhor_individuo = population[ordem[0]].copy()
+                ultima_melhoria = geracao
+            if medidor is not None:
+                medidor.marcar("ordenacao")
+                medidor.registrar_populacao(population, desperdicios, avaliacoes, melhor_desperdicio)
+
+            # Critérios de parada
+            if parar_no_otimo and melhor_desperdicio <= limite_inferior:
+                motivo_parada = "otimo"
+                break
+            if tempo_limite is not None and time.time() - inicio >= tempo_limite:
+                motivo_parada = "tempo"
+                break
+            if max_estagnacao is not None and geracao - ultima_melhoria >= max_estagnacao:
+                if not reiniciar_na_estagnacao:
+                    motivo_parada = "estagnacao"
+                    break
+                # Reinício: população nova, preservando só o melhor indivíduo
+                population = random_population(pop_size, num_genes(instancia, decoder), rng)
+                population[0] = melhor_individuo
+                desperdicios = None
+                if incremental is not None:
+                    incremental.reiniciar()
+                ultima_melhoria = geracao
+                continue
+
+            # Nova população
+            population = proxima_geracao(population, ordem, elite_size, mutant_size, inherit_prob, rng, medidor)
+            desperdicios = desperdicios[ordem[:elite_size]]
+            if incremental is not None:
+                incremental.selecionar(ordem[:elite_size])
+            if medidor is not None:
+                medidor.marcar("nova_geracao")
+
+            if arquivo_checkpoint is not None and (geracao + 1) % intervalo_checkpoint == 0:
+                salvar_checkpoint(arquivo_checkpoint, Checkpoint(
+                    population=population, num_elites=elite_size, geracao=geracao + 1,
+                    ultima_melhoria=ultima_melhoria, tempo_decorrido=time.time() - inicio,
+                    melhor_individuo=melhor_individuo, melhor_desperdicio=melhor_desperdicio,
+                    decoder=decoder, estado_rng=rng.bit_generator.state,
+                ))
+                if medidor is not None:
+                    medidor.marcar("checkpoint")
+    finally:
+        if medidor is not None:
+            medidor.encerrar()
+        if avaliador is not None:
+            avaliador.close()
+
+    # Decode final
+    bins, desperdicio_final = decode(melhor_individuo, instancia, decoder)
+    num_bins = len(bins)
+    sequencia_de_corte = [ [tipo for _, tipo, _ in bin] for bin in bins]
+
+    return num_bins, desperdicio_final, sequencia_de_corte, motivo_parada
@@ -0,0 +1,156 @@
+import multiprocessing
+import queue
+
+import numpy as np
+
+from .decoders import decode, num_genes
+from .ga import avaliar_populacao, proxima_geracao, random_population, ranquear
+from .instancia import INSTANCIA
+from .parametros import DECODER, INTERVALO_MIGRACAO, NUM_ILHAS, NUM_MIGRANTES
+
+# ========= MODELO DE ILHAS =========
+
+INTERVALO_ESPERA_ILHAS = 0.5   # segundos entre verificações de ilhas mortas
+
+def _ilha(indice, num_geracoes, parametros, instancia, semente, entrada, saida, resultados,
+          intervalo_migracao, num_migrantes, decoder):
+    # Processo de uma ilha: publica (indice, melhor_desperdicio, melhor_individuo)
+    # ou, se a evolução falhar, (indice, exceção) para o processo pai relançar
+    # Migrantes pendentes na fila não devem segurar o fim do processo
+    entrada.cancel_join_thread()
+    saida.cancel_join_thread()
+    try:
+        melhor_desperdicio, melhor_individuo = _evoluir_ilha(
+            num_geracoes, parametros, instancia, semente, entrada, saida, intervalo_migracao, num_migrantes,
+            decoder,
+        )
+    except Exception as exc:
+        resultados.put((indice, exc))
+    else:
+        resultados.put((indice, melhor_desperdicio, melhor_individuo))
+
+def _evoluir_ilha(num_geracoes, parametros, instancia, semente, entrada, saida, intervalo_migracao,
+                  num_migrantes, decoder):
+    # Uma ilha roda o mesmo esquema elite/mutante/crossover do brgka_simples.
+    # A cada intervalo_migracao gerações manda as melhores elites para a ilha
+    # seguinte do anel e recebe, sem bloquear, as que chegaram da anterior.
+    rng = np.random.default_rng(semente)
+
+    pop_size = parametros["pop_size"]
+    elite_size = int(parametros["elite_frac"] * pop_size)
+    mutant_size = int(parametros["mutant_frac"] * pop_size)
+    inherit_prob = parametros["inherit_prob"]
+    num_ranqueados = max(elite_size, num_migrantes, 1)
+
+    population = random_population(pop_size, num_genes(instancia, decoder), rng)
+    desperdicios = None
+    melhor_individuo = None
+    melhor_desperdicio = float("inf")
+
+    for geracao in range(num_geracoes):
+        desperdicios = avaliar_populacao(population, desperdicios, instancia, decoder=decoder)
+        ordem = ranquear(desperdicios, num_ranqueados)
+
+        if num_migrantes and geracao % intervalo_migracao == intervalo_migracao - 1:
+            melhores = ordem[:num_migrantes]
+            try:
+                saida.put_nowait((population[melhores].copy(), desperdicios[melhores].copy()))
+            except queue.Full:
+                pass    # vizinha atrasada: descarta esta migração
+            try:
+                migrantes, desperdicios_migrantes = entrada.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                # Migrantes substituem os piores indivíduos
+                piores = np.argpartition(desperdicios, len(desperdicios) - len(migrantes))[-len(migrantes):]
+                population[piores] = migrantes
+                desperdicios[piores] = desperdicios_migrantes
+                ordem = ranquear(desperdicios, num_ranqueados)
+
+        if desperdicios[ordem[0]] < melhor_desperdicio:
+            melhor_desperdicio = desperdicios[ordem[0]]
+            melhor_individuo = population[ordem[0]].copy()
+
+        population = proxima_geracao(population, ordem, elite_size, mutant_size, inherit_prob, rng)
+        desperdicios = desperdicios[ordem[:elite_size]]
+
+    return melhor_desperdicio, melhor_individuo
+
+def _coletar_resultados(processos, resultados):
+    # Espera o resultado de cada ilha sem bloquear para sempre: relança o primeiro
+    # erro publicado por uma ilha e acusa ilhas que terminaram sem publicar nada,
+    # inclusive com código 0 (ex.: a exceção não pôde ser serializada pela fila)
+    melhores = {}
+
+    def receber(resultado):
+        if len(resultado) == 2:
+            _, erro = resultado
+            raise erro
+        melhores[resultado[0]] = resultado
+
+    while len(melhores) < len(processos):
+        try:
+            receber(resultados.get(timeout=INTERVALO_ESPERA_ILHAS))
+            continue
+        except queue.Empty:
+            pass
+        # Quem já terminou publicou antes de sair: anota os encerrados e esvazia a
+        # fila uma última vez antes de acusar os que ficaram sem resultado
+        encerrados = [k for k, processo in enumerate(processos) if processo.exitcode is not None]
+        while True:
+            try:
+                receber(resultados.get_nowait())
+            except queue.Empty:
+                break
+        for k in encerrados:
+            if k not in melhores:
+                raise RuntimeError(f"A ilha {k} terminou com código {processos[k].exitcode} sem resultado")
+    return list(melhores.values())
+
+def brkga_ilhas(num_geracoes, pop_size, elite_frac, mutant_frac, inherit_prob, instancia=INSTANCIA,
+                num_ilhas=NUM_ILHAS, intervalo_migracao=INTERVALO_MIGRACAO, num_migrantes=NUM_MIGRANTES,
+                semente=None, decoder=DECODER):
+    # Roda num_ilhas populações em processos separados, ligadas em anel por filas.
+    # Retorna (num_bins, desperdicio, sequencia_de_corte, motivo_parada) do melhor entre as ilhas.
+    if num_geracoes < 1:
+        raise ValueError(f"num_geracoes deve ser pelo menos 1, recebeu {num_geracoes}")
+    parametros = {
+        "pop_size": pop_size,
+        "elite_frac": elite_frac,
+        "mutant_frac": mutant_frac,
+        "inherit_prob": inherit_prob,
+    }
+    # Fluxos independentes por ilha, derivados da mesma semente
+    sementes = np.random.SeedSequence(semente).spawn(num_ilhas)
+    # Filas curtas: se a vizinha não consumiu, a migração seguinte é descartada
+    filas = [multiprocessing.Queue(maxsize=2) for _ in range(num_ilhas)]
+    resultados = multiprocessing.Queue()
+
+    processos = [
+        multiprocessing.Process(
+            target=_ilha,
+            args=(k, num_geracoes, parametros, instancia, sementes[k],
+                  filas[k], filas[(k + 1) % num_ilhas], resultados,
+                  intervalo_migracao, num_migrantes, decoder),
+            daemon=True,
+        )
+        for k in range(num_ilhas)
+    ]
+    try:
+        for processo in processos:
+            processo.start()
+        melhores = _coletar_resultados(processos, resultados)
+    finally:
+        for processo in processos:
+            if processo.is_alive():
+                processo.terminate()
+            if processo.pid is not None:
+                processo.join()
+
+    _, _, melhor_individuo = min(melhores, key=lambda r: (r[1], r[0]))
+    bins, desperdicio_final = decode(melhor_individuo, instancia, decoder)
+    num_bins = len(bins)
+    sequencia_de_corte = [ [tipo for _, tipo, _ in bin] for bin in bins]
+
+    return num_bins, desperdicio_final, sequencia_de_corte, "geracoes"
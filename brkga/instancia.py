@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .parametros import BIN_CAPACITY, CAMISA_COUNTS, ITEM_TYPES, UNIDADES_POR_METRO
+
+# ========= INSTÂNCIA DO PROBLEMA =========
+
+def _somente_leitura(array):
+    array.flags.writeable = False
+    return array
+
+def _em_unidades(valor, unidade):
+    # Metros -> unidades inteiras; recusa medidas que a unidade não representa exatamente
+    inteiro = round(valor * unidade)
+    if abs(valor * unidade - inteiro) > 1e-6:
+        raise ValueError(f"{valor} m não é múltiplo de 1/{unidade} m (ajuste UNIDADES_POR_METRO)")
+    return inteiro
+
+@dataclass(frozen=True, eq=False)
+class Instance:
+    # Instância pré-compilada, montada uma vez a partir de ITEM_TYPES, CAMISA_COUNTS
+    # e BIN_CAPACITY. Os itens seguem a ordem fixa da demanda. Ex.: [P,P,M,M,M,G,G,G,G,GG]
+    # As contas de empacotamento são feitas em unidades inteiras (1/unidade m), exatas;
+    # os campos em metros servem para exibir e relatar.
+    tipos: tuple                      # nome de cada tipo; o código do tipo é o índice aqui
+    tamanhos_tipo: np.ndarray         # tamanho por código de tipo, em metros
+    contagens: tuple                  # demanda por código de tipo
+    capacidade: float                 # em metros
+    codigos: np.ndarray               # código do tipo de cada item (int8)
+    tamanhos: np.ndarray              # tamanho de cada item, em metros
+    tamanho_total: float
+    limite_inferior_bins: int         # ceil(tamanho_total / capacidade)
+    limite_inferior_desperdicio: float
+    unidade: int                      # unidades inteiras por metro
+    tamanhos_tipo_int: np.ndarray     # tamanho por código de tipo, em unidades
+    capacidade_int: int
+    # Tabelas do next-fit, indexadas por (resíduo do bin aberto, código do tipo):
+    cabe: np.ndarray                  # o item cabe no resíduo
+    proximo_residuo: np.ndarray       # resíduo depois do item (no mesmo bin ou num bin novo)
+
+    @classmethod
+    def build(cls, item_types, camisa_counts, bin_capacity, unidade=UNIDADES_POR_METRO):
+        tipos = tuple(camisa_counts)
+        tamanhos_tipo = np.array([item_types[tipo] for tipo in tipos], dtype=np.float64)
+        contagens = tuple(int(camisa_counts[tipo]) for tipo in tipos)
+        codigos = np.repeat(np.arange(len(tipos), dtype=np.int8), contagens)
+        tamanhos = tamanhos_tipo[codigos]
+
+        tamanhos_tipo_int = np.array(
+            [_em_unidades(item_types[tipo], unidade) for tipo in tipos], dtype=np.int64
+        )
+        capacidade_int = _em_unidades(bin_capacity, unidade)
+        if len(tipos) and tamanhos_tipo_int.max() > capacidade_int:
+            raise ValueError("Há camisas maiores que o rolo")
+        residuos = np.arange(capacidade_int + 1)[:, None]
+        cabe = tamanhos_tipo_int[None, :] <= residuos
+        proximo_residuo = np.where(cabe, residuos - tamanhos_tipo_int, capacidade_int - tamanhos_tipo_int)
+
+        tamanho_total_int = int(tamanhos_tipo_int @ np.array(contagens, dtype=np.int64))
+        limite_bins = -(-tamanho_total_int // capacidade_int)
+        return cls(
+            tipos=tipos,
+            tamanhos_tipo=_somente_leitura(tamanhos_tipo),
+            contagens=contagens,
+            capacidade=float(bin_capacity),
+            codigos=_somente_leitura(codigos),
+            tamanhos=_somente_leitura(tamanhos),
+            tamanho_total=tamanho_total_int / unidade,
+            limite_inferior_bins=limite_bins,
+            limite_inferior_desperdicio=(limite_bins * capacidade_int - tamanho_total_int) / unidade,
+            unidade=unidade,
+            tamanhos_tipo_int=_somente_leitura(tamanhos_tipo_int),
+            capacidade_int=capacidade_int,
+            cabe=_somente_leitura(cabe),
+            proximo_residuo=_somente_leitura(proximo_residuo),
+        )
+
+    @property
+    def num_itens(self):
+        return len(self.codigos)
+
+INSTANCIA = Instance.build(ITEM_TYPES, CAMISA_COUNTS, BIN_CAPACITY)
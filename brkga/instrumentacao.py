@@ -0,0 +1,108 @@
+import json
+import time
+
+# ========= INSTRUMENTAÇÃO DO LAÇO DO GA =========
+# Observadores são chamáveis que recebem um dicionário de métricas por geração.
+# O brgka_simples só cria o Medidor quando recebe observadores; sem eles, o custo
+# no laço é um teste de None por fase.
+
+# nova_geracao: cópia das elites e manutenção; mutantes e crossover têm fase própria
+FASES = ("avaliacao", "ordenacao", "busca_local", "mutantes", "crossover", "nova_geracao", "checkpoint")
+
+class Medidor:
+    # Cronometra as fases de cada geração e publica o registro da geração
+    # anterior quando a seguinte começa (ou no encerrar), já com todas as fases
+    def __init__(self, observadores, cache=None, incremental=None):
+        self.observadores = list(observadores)
+        self.cache = cache
+        self.incremental = incremental
+        self.inicio = time.perf_counter()
+        self._marca = self.inicio
+        self._registro = None
+
+    def iniciar_geracao(self, geracao):
+        self._publicar()
+        self._registro = {"geracao": geracao}
+        for fase in FASES:
+            self._registro["tempo_" + fase] = 0.0
+        self._marca = time.perf_counter()
+
+    def marcar(self, fase):
+        # Soma à fase o tempo desde a última marca
+        agora = time.perf_counter()
+        self._registro["tempo_" + fase] += agora - self._marca
+        self._marca = agora
+
+    def registrar_populacao(self, population, desperdicios, avaliacoes, melhor_desperdicio):
+        # Estatísticas da população avaliada; o tempo gasto aqui fica fora das fases
+        registro = self._registro
+        registro["avaliacoes"] = avaliacoes
+        tempo_avaliacao = registro["tempo_avaliacao"]
+        registro["avaliacoes_por_segundo"] = avaliacoes / tempo_avaliacao if tempo_avaliacao > 0 else 0.0
+        registro["melhor"] = float(desperdicios.min())
+        registro["media"] = float(desperdicios.mean())
+        # Diversidade: desvio padrão médio dos genes na população
+        registro["diversidade"] = float(population.std(axis=0).mean())
+        registro["melhor_global"] = float(melhor_desperdicio)
+        if self.cache is not None:
+            consultas = self.cache.hits + self.cache.misses
+            registro["taxa_acerto_cache"] = self.cache.hits / consultas if consultas else 0.0
+        if self.incremental is not None and self.incremental.posicoes_totais:
+            registro["reaproveitamento_incremental"] = (
+                self.incremental.posicoes_reaproveitadas / self.incremental.posicoes_totais
+            )
+        self._marca = time.perf_counter()
+
+    def encerrar(self):
+        self._publicar()
+
+    def _publicar(self):
+        if self._registro is None:
+            return
+        self._registro["tempo_total"] = time.perf_counter() - self.inicio
+        for observador in self.observadores:
+            observador(self._registro)
+        self._registro = None
+
+# ========= OBSERVADORES PRONTOS =========
+
+class GravadorMetricas:
+    # Fluxo de métricas em JSON Lines: uma linha por geração (ou a cada intervalo)
+    def __init__(self, caminho, intervalo=1):
+        self.intervalo = intervalo
+        self.arquivo = open(caminho, "w", encoding="utf-8")
+
+    def __call__(self, registro):
+        if registro["geracao"] % self.intervalo == 0:
+            self.arquivo.write(json.dumps(registro) + "\n")
+
+    def close(self):
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ResumoFases:
+    # Acumula o tempo por fase e as avaliações da execução inteira
+    def __init__(self):
+        self.tempos = dict.fromkeys(FASES, 0.0)
+        self.avaliacoes = 0
+        self.geracoes = 0
+
+    def __call__(self, registro):
+        for fase in FASES:
+            self.tempos[fase] += registro["tempo_" + fase]
+        self.avaliacoes += registro.get("avaliacoes", 0)
+        self.geracoes += 1
+
+    def relatorio(self):
+        total = sum(self.tempos.values()) or 1.0
+        linhas = [f"{self.geracoes} gerações, {self.avaliacoes} avaliações"]
+        for fase in FASES:
+            linhas.append(f"  {fase:<13} {self.tempos[fase]:8.3f}s ({100 * self.tempos[fase] / total:5.1f}%)")
+        if self.tempos["avaliacao"] > 0:
+            linhas.append(f"  {self.avaliacoes / self.tempos['avaliacao']:.0f} avaliações/s")
+        return "\n".join(linhas)
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .instancia import INSTANCIA
+
+# ========= CODIFICAÇÃO AGREGADA POR PADRÕES DE CORTE =========
+# Para instâncias com poucos tipos e demandas grandes, o cromossomo deixa de ter
+# um gene por camisa. Cada padrão de corte viável (quantas camisas de cada tipo
+# cabem juntas num rolo) recebe dois genes: a prioridade (ordem em que os padrões
+# são usados) e a fração da multiplicidade máxima a aplicar. O tamanho do
+# cromossomo passa a depender só dos tipos e da capacidade, não da demanda.
+
+@dataclass(frozen=True, eq=False)
+class Padroes:
+    matriz: np.ndarray    # (num_padroes, num_tipos): quantidade de cada tipo no padrão
+    cargas: np.ndarray    # comprimento ocupado por padrão, em unidades inteiras (Instance.unidade)
+
+    @property
+    def num_padroes(self):
+        return len(self.matriz)
+
+def enumerar_padroes(instancia=INSTANCIA):
+    # Todos os padrões não vazios que cabem num rolo e não pedem mais que a demanda
+    tamanhos_tipo = instancia.tamanhos_tipo_int.tolist()
+    contagens = instancia.contagens
+    capacidade = instancia.capacidade_int
+    padroes = []
+
+    def expandir(tipo, padrao, carga):
+        if tipo == len(tamanhos_tipo):
+            if carga > 0:
+                padroes.append(list(padrao))
+            return
+        qtd = 0
+        while qtd <= contagens[tipo] and carga + qtd * tamanhos_tipo[tipo] <= capacidade:
+            padrao.append(qtd)
+            expandir(tipo + 1, padrao, carga + qtd * tamanhos_tipo[tipo])
+            padrao.pop()
+            qtd += 1
+
+    expandir(0, [], 0)
+    matriz = np.array(padroes, dtype=np.int64).reshape(-1, len(tamanhos_tipo))
+    return Padroes(matriz=matriz, cargas=matriz @ instancia.tamanhos_tipo_int)
+
+@lru_cache(maxsize=32)
+def padroes_da_instancia(instancia):
+    # A enumeração é feita uma vez por instância
+    return enumerar_padroes(instancia)
+
+def num_genes_padroes(instancia=INSTANCIA):
+    return 2 * padroes_da_instancia(instancia).num_padroes
+
+def decode_padroes_batch(population, instancia=INSTANCIA):
+    # Aplica os padrões na ordem das prioridades, todas as linhas em paralelo.
+    # 1ª passada: cada padrão usa a fração indicada pelo seu gene da multiplicidade
+    # máxima permitida pela demanda restante. 2ª passada: completa a demanda com
+    # a multiplicidade máxima (os padrões de uma camisa só garantem que tudo é cortado).
+    padroes = padroes_da_instancia(instancia)
+    matriz, cargas = padroes.matriz, padroes.cargas
+    num_padroes = padroes.num_padroes
+    num_individuos = population.shape[0]
+    linhas = np.arange(num_individuos)
+
+    ordem = np.argsort(population[:, :num_padroes], axis=1, kind="stable")
+    fracoes = population[:, num_padroes:]
+    restante = np.tile(np.array(instancia.contagens, dtype=np.int64), (num_individuos, 1))
+    sobras = np.zeros(num_individuos, dtype=np.int64)
+    num_bins = np.zeros(num_individuos, dtype=np.int64)
+    desperdicio_padrao = instancia.capacidade_int - cargas
+    usa_tipo = matriz > 0
+
+    for passada in range(2):
+        for j in range(num_padroes):
+            p = ordem[:, j]
+            padrao = matriz[p]
+            maximo = np.where(usa_tipo[p], restante // np.maximum(padrao, 1), np.iinfo(np.int64).max).min(axis=1)
+            if passada == 0:
+                copias = np.minimum((fracoes[linhas, p] * (maximo + 1)).astype(np.int64), maximo)
+            else:
+                copias = maximo
+            restante -= copias[:, None] * padrao
+            num_bins += copias
+            sobras += copias * desperdicio_padrao[p]
+
+    return sobras / instancia.unidade, num_bins
+
+def plano_de_corte(individual, instancia=INSTANCIA):
+    # Mesma regra de decode_padroes_batch para um indivíduo: lista de (padrão, cópias)
+    padroes = padroes_da_instancia(instancia)
+    matriz = padroes.matriz.tolist()
+    num_padroes = padroes.num_padroes
+    individual = np.asarray(individual)
+    ordem = np.argsort(individual[:num_padroes], kind="stable").tolist()
+    fracoes = individual[num_padroes:].tolist()
+    restante = list(instancia.contagens)
+
+    plano = []
+    for passada in range(2):
+        for p in ordem:
+            padrao = matriz[p]
+            maximo = min(restante[t] // qtd for t, qtd in enumerate(padrao) if qtd > 0)
+            copias = min(int(fracoes[p] * (maximo + 1)), maximo) if passada == 0 else maximo
+            if copias:
+                for t, qtd in enumerate(padrao):
+                    restante[t] -= copias * qtd
+                plano.append((p, copias))
+    return plano
+
+def decode_padroes(individual, instancia=INSTANCIA):
+    # Expande o plano em bins no mesmo formato de decode(): listas de (posição, tipo, tamanho)
+    padroes = padroes_da_instancia(instancia)
+    cargas = padroes.cargas.tolist()
+    tipos = instancia.tipos
+    tamanhos_tipo = instancia.tamanhos_tipo.tolist()
+    capacidade = instancia.capacidade_int
+
+    bins = []
+    sobra_total = 0
+    i = 0
+    for p, copias in plano_de_corte(individual, instancia):
+        conteudo = [t for t, qtd in enumerate(padroes.matriz[p].tolist()) for _ in range(qtd)]
+        for _ in range(copias):
+            bins.append([(i + k, tipos[t], tamanhos_tipo[t]) for k, t in enumerate(conteudo)])
+            i += len(conteudo)
+        sobra_total += copias * (capacidade - cargas[p])
+    return bins, sobra_total / instancia.unidade
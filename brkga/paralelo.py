@@ -0,0 +1,78 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .decoders import decode_batch, num_genes
+from .parametros import DECODER
+
+# ========= AVALIAÇÃO PARALELA =========
+
+# Estado de cada processo trabalhador, preenchido pelo initializer do pool
+_trabalhador = {}
+
+def _inicializar_trabalhador(nome_memoria, forma, instancia, decoder):
+    # O bloco é criado e removido pelo processo principal; o trabalhador só o lê
+    memoria = shared_memory.SharedMemory(name=nome_memoria)
+    _trabalhador["memoria"] = memoria
+    _trabalhador["population"] = np.ndarray(forma, dtype=np.float64, buffer=memoria.buf)
+    _trabalhador["instancia"] = instancia
+    _trabalhador["decoder"] = decoder
+
+def _decode_fatia(inicio, fim):
+    return decode_batch(
+        _trabalhador["population"][inicio:fim], _trabalhador["instancia"], decoder=_trabalhador["decoder"]
+    )
+
+class AvaliadorParalelo:
+    # Pool de processos persistente para decodificar a população. A matriz vai para
+    # os trabalhadores por um bloco de memória compartilhada; cada tarefa só leva
+    # o intervalo de linhas (inicio, fim) e volta com (sobras, num_bins) da fatia.
+    def __init__(self, instancia, max_linhas, num_workers=None, decoder=DECODER):
+        self.executor = None
+        forma = (max_linhas, num_genes(instancia, decoder))
+        self.memoria = shared_memory.SharedMemory(create=True, size=max(1, forma[0] * forma[1] * 8))
+        self.buffer = np.ndarray(forma, dtype=np.float64, buffer=self.memoria.buf)
+        # Processos do pool; também define em quantas fatias a população é dividida
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            initializer=_inicializar_trabalhador,
+            initargs=(self.memoria.name, forma, instancia, decoder),
+        )
+
+    def decode_batch(self, population):
+        num_linhas = len(population)
+        self.buffer[:num_linhas] = population
+        limites = np.linspace(0, num_linhas, min(self.num_workers, num_linhas) + 1, dtype=int)
+        tarefas = [
+            self.executor.submit(_decode_fatia, inicio, fim)
+            for inicio, fim in zip(limites[:-1], limites[1:])
+        ]
+        resultados = [tarefa.result() for tarefa in tarefas]
+        if not resultados:
+            return np.zeros(0), np.zeros(0, dtype=np.int64)
+        sobras = np.concatenate([sobras for sobras, _ in resultados])
+        num_bins = np.concatenate([num_bins for _, num_bins in resultados])
+        return sobras, num_bins
+
+    def fitness_batch(self, population):
+        sobras, _ = self.decode_batch(population)
+        return sobras
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.memoria is not None:
+            self.buffer = None
+            self.memoria.close()
+            self.memoria.unlink()
+            self.memoria = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,37 @@
+# ========= PARAMETROS DO PROBLEMA =========
+ITEM_TYPES = {"P": 1.5, "M": 1.55, "G": 1.90, "GG": 2.20}
+n=10
+CAMISA_COUNTS = {"P": n*5, "M": n*15, "G": n*10, "GG": n*7}
+BIN_CAPACITY = 5.0
+UNIDADES_POR_METRO = 100  # as contas são feitas em centímetros inteiros
+
+# PARAMETROS DO ALG. GENÉTICO
+POP_SIZE = 100
+ELITE_FRAC = 0.2
+MUTANT_FRAC = 0.4
+INHERIT_PROB = 0.5
+CACHE_SIZE = 0          # entradas do cache de fitness por ordem decodificada (0 = desligado)
+NUM_WORKERS = 0         # processos para avaliar a população (0 ou 1 = avaliação no processo principal)
+DECODER = "next_fit"    # estratégia de empacotamento do decoder (veja DECODERS) ou "padroes"
+DECODE_INCREMENTAL = False  # retoma o next-fit a partir do prefixo em comum com uma elite já decodificada
+INTERVALO_BUSCA_LOCAL = None  # gerações entre buscas locais nas melhores elites (None = desligada)
+ELITES_BUSCA_LOCAL = 3  # quantas das melhores elites passam pela busca local
+MAX_MOVIMENTOS_BUSCA_LOCAL = 1000  # movimentos por indivíduo em cada busca local
+
+# CRITÉRIOS DE PARADA (None = desligado)
+TEMPO_LIMITE = None     # segundos de relógio
+MAX_ESTAGNACAO = None   # gerações seguidas sem melhorar o melhor desperdício
+REINICIAR_NA_ESTAGNACAO = False  # na estagnação, reinicia a população (mantendo o melhor) em vez de parar
+PARAR_NO_OTIMO = True   # para ao atingir o limite inferior de desperdício da instância
+
+# HISTÓRICO DE CONVERGÊNCIA
+INTERVALO_CONVERGENCIA = 10  # gerações entre linhas do CSV de convergência
+PONTOS_HISTORICO = 512  # pontos do histórico mantidos em memória para o gráfico
+
+# CHECKPOINT (com arquivo_checkpoint no brgka_simples)
+INTERVALO_CHECKPOINT = 1000  # gerações entre gravações do checkpoint
+
+# PARAMETROS DO MODELO DE ILHAS
+NUM_ILHAS = 4           # populações independentes, uma por processo
+INTERVALO_MIGRACAO = 100  # gerações entre migrações
+NUM_MIGRANTES = 2       # elites enviadas para a ilha vizinha a cada migração
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .decoders import DECODER_PADROES, chaves_de_sequencia
+from .experimentos import PARAMETROS_PADRAO, PASTA_RESULTADOS
+from .ga import brgka_simples
+from .instancia import Instance
+from .parametros import BIN_CAPACITY, ITEM_TYPES
+
+# ========= LOTES DE PEDIDOS =========
+# Pedidos que só mudam as quantidades por tamanho são resolvidos em lote, num pool
+# de processos, sem editar CAMISA_COUNTS. Cada resultado fica num cache em disco,
+# indexado pela assinatura da instância normalizada (tamanhos, quantidades,
+# capacidade) e da configuração do solver: um pedido repetido volta na hora, e um
+# pedido novo parte da solução em cache mais parecida (mesmos tamanhos e rolo).
+
+PASTA_CACHE_PEDIDOS = os.path.join(PASTA_RESULTADOS, "cache_pedidos")
+
+def _normalizar(instancia):
+    # Tipos em ordem de nome, sem os de quantidade zero; medidas em unidades inteiras
+    tipos = sorted(
+        (tipo, int(tamanho), qtd)
+        for tipo, tamanho, qtd in zip(instancia.tipos, instancia.tamanhos_tipo_int, instancia.contagens)
+        if qtd > 0
+    )
+    return {
+        "tipos": [tipo for tipo, _, _ in tipos],
+        "tamanhos": [tamanho for _, tamanho, _ in tipos],
+        "contagens": [qtd for _, _, qtd in tipos],
+        "capacidade": instancia.capacidade_int,
+        "unidade": instancia.unidade,
+    }
+
+def assinatura_pedido(instancia, num_geracoes, parametros):
+    chave = {"instancia": _normalizar(instancia), "num_geracoes": num_geracoes, "parametros": parametros}
+    return hashlib.sha256(json.dumps(chave, sort_keys=True).encode("utf-8")).hexdigest()
+
+def adaptar_sequencia(sequencia_de_corte, contagens):
+    # Ajusta uma sequência de corte a outras quantidades: tira as camisas que
+    # sobram e acrescenta as que faltam num trecho final
+    restante = dict(contagens)
+    adaptada = []
+    for bin in sequencia_de_corte:
+        novo_bin = []
+        for tipo in bin:
+            if restante.get(tipo, 0) > 0:
+                novo_bin.append(tipo)
+                restante[tipo] -= 1
+        if novo_bin:
+            adaptada.append(novo_bin)
+    faltando = [tipo for tipo, qtd in restante.items() for _ in range(qtd)]
+    if faltando:
+        adaptada.append(faltando)
+    return adaptada
+
+class CacheResultados:
+    # Um JSON por assinatura na pasta; os cabeçalhos ficam em memória para achar
+    # o vizinho mais próximo sem reler os arquivos
+    def __init__(self, pasta=PASTA_CACHE_PEDIDOS):
+        self.pasta = pasta
+        os.makedirs(pasta, exist_ok=True)
+        self._entradas = {}
+        for nome in os.listdir(pasta):
+            if nome.endswith(".json"):
+                with open(os.path.join(pasta, nome), encoding="utf-8") as arquivo:
+                    entrada = json.load(arquivo)
+                self._entradas[entrada["assinatura"]] = entrada
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def get(self, assinatura):
+        return self._entradas.get(assinatura)
+
+    def put(self, entrada):
+        caminho = os.path.join(self.pasta, entrada["assinatura"] + ".json")
+        with open(caminho + ".tmp", "w", encoding="utf-8") as arquivo:
+            json.dump(entrada, arquivo)
+        os.replace(caminho + ".tmp", caminho)
+        self._entradas[entrada["assinatura"]] = entrada
+
+    def mais_proximo(self, instancia, parametros):
+        # Entrada com os mesmos tamanhos, rolo e configuração e a menor distância L1
+        # entre as quantidades; None se não houver
+        normal = _normalizar(instancia)
+        alvo = dict(zip(normal["tipos"], normal["contagens"]))
+        melhor, menor_distancia = None, None
+        for entrada in self._entradas.values():
+            outra = entrada["instancia"]
+            if (outra["capacidade"], outra["unidade"]) != (normal["capacidade"], normal["unidade"]):
+                continue
+            if entrada["parametros"] != parametros:
+                continue
+            tamanhos = dict(zip(outra["tipos"], outra["tamanhos"]))
+            if any(tamanhos.get(tipo, tamanho) != tamanho for tipo, tamanho in zip(normal["tipos"],
+                                                                                  normal["tamanhos"])):
+                continue
+            contagens = dict(zip(outra["tipos"], outra["contagens"]))
+            distancia = sum(abs(alvo.get(tipo, 0) - contagens.get(tipo, 0)) for tipo in set(alvo) | set(contagens))
+            if menor_distancia is None or distancia < menor_distancia:
+                melhor, menor_distancia = entrada, distancia
+        return melhor
+
+def _resolver_pedido(num_geracoes, parametros, instancia, semente, populacao_inicial):
+    return brgka_simples(
+        num_geracoes, instancia=instancia, semente=semente, populacao_inicial=populacao_inicial, **parametros
+    )
+
+def resolver_pedidos(pedidos, num_geracoes, parametros=None, item_types=ITEM_TYPES, bin_capacity=BIN_CAPACITY,
+                     max_workers=None, semente=None, pasta_cache=PASTA_CACHE_PEDIDOS):
+    # pedidos: lista de dicionários {tamanho: quantidade}. Retorna, na ordem dos pedidos,
+    # (num_bins, desperdicio, sequencia_de_corte, motivo_parada, origem), com origem
+    # "cache" (já resolvido antes), "lote" (igual a outro pedido deste lote) ou "resolvido".
+    # pasta_cache=None desliga o cache em disco.
+    if num_geracoes < 1:
+        raise ValueError(f"num_geracoes deve ser pelo menos 1, recebeu {num_geracoes}")
+    if parametros is None:
+        parametros = PARAMETROS_PADRAO
+    cache = CacheResultados(pasta_cache) if pasta_cache is not None else None
+    instancias = [Instance.build(item_types, pedido, bin_capacity) for pedido in pedidos]
+    assinaturas = [assinatura_pedido(instancia, num_geracoes, parametros) for instancia in instancias]
+
+    resultados = [None] * len(pedidos)
+    jobs = {}    # assinatura -> índice do primeiro pedido com ela
+    for k, assinatura in enumerate(assinaturas):
+        entrada = cache.get(assinatura) if cache is not None else None
+        if entrada is not None:
+            resultados[k] = (entrada["num_bins"], entrada["desperdicio"], entrada["sequencia_de_corte"],
+                             entrada["motivo_parada"], "cache")
+        elif assinatura not in jobs:
+            jobs[assinatura] = k
+
+    sementes = [int(seq.generate_state(1)[0]) for seq in np.random.SeedSequence(semente).spawn(len(jobs))]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futuros = {}
+        for (assinatura, k), semente_job in zip(jobs.items(), sementes):
+            instancia = instancias[k]
+            populacao_inicial = None
+            vizinho = cache.mais_proximo(instancia, parametros) if cache is not None else None
+            if vizinho is not None and parametros.get("decoder") != DECODER_PADROES:
+                sequencia = adaptar_sequencia(vizinho["sequencia_de_corte"], dict(zip(instancia.tipos,
+                                                                                      instancia.contagens)))
+                populacao_inicial = chaves_de_sequencia(sequencia, instancia)[None, :]
+            futuro = executor.submit(_resolver_pedido, num_geracoes, parametros, instancia, semente_job,
+                                     populacao_inicial)
+            futuros[futuro] = assinatura, k, semente_job
+
+        for futuro, (assinatura, k, semente_job) in futuros.items():
+            num_bins, desperdicio, sequencia_de_corte, motivo_parada = futuro.result()
+            resultados[k] = (num_bins, desperdicio, sequencia_de_corte, motivo_parada, "resolvido")
+            if cache is not None:
+                cache.put({
+                    "assinatura": assinatura,
+                    "instancia": _normalizar(instancias[k]),
+                    "num_geracoes": num_geracoes,
+                    "parametros": parametros,
+                    "num_bins": num_bins,
+                    "desperdicio": desperdicio,
+                    "sequencia_de_corte": sequencia_de_corte,
+                    "motivo_parada": motivo_parada,
+                    "semente": semente_job,
+                })
+
+    # Pedidos repetidos dentro do lote recebem o resultado do primeiro
+    for k, assinatura in enumerate(assinaturas):
+        if resultados[k] is None:
+            num_bins, desperdicio, sequencia_de_corte, motivo_parada, _ = resultados[jobs[assinatura]]
+            resultados[k] = (num_bins, desperdicio, sequencia_de_corte, motivo_parada, "lote")
+    return resultados
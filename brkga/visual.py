@@ -0,0 +1,276 @@
+import math
+import threading
+
+import numpy as np
+import pygame
+
+from .convergencia import RegistroConvergencia
+from .decoders import FitnessCache, decode, num_genes
+from .ga import avaliar_populacao, proxima_geracao, random_population, ranquear
+from .instancia import INSTANCIA
+from .parametros import (
+    BIN_CAPACITY, CACHE_SIZE, DECODER, ELITE_FRAC, INHERIT_PROB, MUTANT_FRAC, POP_SIZE,
+)
+
+# PARAMETROS DE INTERFACE GRÁFICA
+CORES = {"P": (255, 100, 100), "M": (100, 255, 100), "G": (100, 100, 255), "GG": (240, 240, 50)}
+LARGURA_TELA, ALTURA_TELA = 1200, 700
+BG = (30, 30, 30)
+BRANCO = (255, 255, 255)
+AMARELO = (255, 255, 0)
+FPS = 60                # quadros por segundo da tela (o GA roda sem limite)
+
+# Tela, relógio e fonte do pygame, criados por executar_visual()
+screen = None
+clock = None
+font = None
+
+# Cache de renderização: a letra de cada tipo (renderizada uma vez), a superfície
+# de cada conteúdo de bin e o quadro com todas as bins, que a cada melhoria só
+# é redesenhado nas linhas cujo conteúdo mudou
+glifos = {}
+superficies_bin = {}
+MAX_SUPERFICIES_BIN = 4096  # conteúdos de bin distintos em cache antes de limpar
+quadro_bins = None
+layout_quadro = None
+conteudos_quadro = []
+
+# ========= FUNÇÕES DE VISUALIZAÇÃO =========
+
+def desenhar_grafico(historico, x, y, largura, altura, max_valor):
+    if len(historico) < 2:
+        return
+    max_valor = max_valor if max_valor > 0 else 1
+    # No máximo um ponto por pixel de largura: o custo não cresce com a execução
+    passo = math.ceil(len(historico) / largura)
+    historico = historico[::passo]
+    if len(historico) < 2:
+        return
+    escala_y = altura / max_valor
+    escala_x = largura / (len(historico) - 1)
+
+    pontos = [(x + i * escala_x, y + altura - valor * escala_y) for i, valor in enumerate(historico)]
+    pygame.draw.lines(screen, AMARELO, False, pontos, 2)
+
+    pygame.draw.line(screen, BRANCO, (x, y), (x, y + altura), 2)
+    pygame.draw.line(screen, BRANCO, (x, y + altura), (x + largura, y + altura), 2)
+
+    texto_max = font.render(f"{max_valor:.2f}", True, BRANCO)
+    screen.blit(texto_max, (x - texto_max.get_width() - 5, y))
+
+def glifo(tipo):
+    if tipo not in glifos:
+        glifos[tipo] = font.render(tipo, True, BRANCO)
+    return glifos[tipo]
+
+def superficie_bin(conteudo, escala, destaque, bin_altura):
+    # conteudo: tupla de (tipo, tamanho); desenhado uma vez por escala e destaque
+    chave = (conteudo, escala, destaque)
+    superficie = superficies_bin.get(chave)
+    if superficie is None:
+        if len(superficies_bin) >= MAX_SUPERFICIES_BIN:
+            superficies_bin.clear()
+        largura_total = sum(round(tamanho * escala) + 1 for _, tamanho in conteudo)
+        superficie = pygame.Surface((max(1, largura_total), bin_altura))
+        superficie.fill(BG)
+        x_atual = 0
+        for tipo, tamanho in conteudo:
+            largura = round(tamanho * escala)
+            pygame.draw.rect(superficie, CORES[tipo], (x_atual, 0, largura, 12))
+            if destaque:
+                pygame.draw.rect(superficie, BRANCO, (x_atual, 0, largura, 12), 1)
+
+            # Letra correspondente, centralizada no retângulo
+            letra_surface = glifo(tipo)
+            superficie.blit(letra_surface, letra_surface.get_rect(center=(x_atual + largura // 2, 6)))
+
+            x_atual += largura + 1  # avança a largura desenhada + espaçamento
+        superficies_bin[chave] = superficie
+    return superficie
+
+def desenhar_bins_e_grafico(bins, geracao, desperdicio, historico, max_desperdicio,
+                            destaque=False, melhoria_valor=None, melhoria_bins=None,
+                            capacidade=BIN_CAPACITY):
+    global quadro_bins, layout_quadro, conteudos_quadro
+    bin_altura = 16
+    altura_disponivel = ALTURA_TELA - 100
+    bins_por_coluna = altura_disponivel // bin_altura
+    total_bins = len(bins)
+    num_colunas = max(1, math.ceil(total_bins / bins_por_coluna))
+
+    area_grafico = 250  # largura reservada à direita para info e gráfico
+    largura_coluna = (LARGURA_TELA - area_grafico) // num_colunas
+
+    escala_max = 80
+    escala = min(escala_max, largura_coluna / capacidade - 5)
+
+    # Quadro das bins: refeito inteiro só quando o layout muda; senão, só as linhas alteradas
+    layout = (num_colunas, escala, destaque)
+    if layout != layout_quadro:
+        quadro_bins = pygame.Surface((LARGURA_TELA, ALTURA_TELA))
+        quadro_bins.fill(BG)
+        layout_quadro = layout
+        conteudos_quadro = []
+    conteudos = [
+        tuple((tipo, tamanho) for _, tipo, tamanho in bin) for bin in bins[:bins_por_coluna * num_colunas]
+    ]
+    for i in range(max(len(conteudos), len(conteudos_quadro))):
+        conteudo = conteudos[i] if i < len(conteudos) else None
+        if i < len(conteudos_quadro) and conteudos_quadro[i] == conteudo:
+            continue
+        coluna = i // bins_por_coluna
+        linha = i % bins_por_coluna
+        x_inicial = 10 + coluna * (largura_coluna + 10)
+        y = 10 + linha * bin_altura
+        quadro_bins.fill(BG, (x_inicial, y, largura_coluna + 10, bin_altura))
+        if conteudo is not None:
+            quadro_bins.blit(superficie_bin(conteudo, escala, destaque, bin_altura), (x_inicial, y))
+    conteudos_quadro = conteudos
+    screen.blit(quadro_bins, (0, 0))
+
+    # Info lateral à direita
+    base_x = num_colunas * (largura_coluna + 10) + 10
+    screen.blit(font.render(f"Geração: {geracao + 1}", True, BRANCO), (base_x, 20))
+    screen.blit(font.render(f"Sobra: {desperdicio:.2f}m", True, BRANCO), (base_x, 50))
+    screen.blit(font.render(f"Bins usados: {len(bins)}", True, BRANCO), (base_x, 80))
+
+    if melhoria_valor is not None:
+        screen.blit(font.render(f"-{melhoria_valor:.2f}", True, AMARELO), (base_x + 140, 50))
+    if melhoria_bins is not None:
+        screen.blit(font.render(f"-{melhoria_bins}", True, AMARELO), (base_x + 140, 80))
+
+    desenhar_grafico(historico, base_x, 110, 180, 580, max_desperdicio)
+    pygame.display.flip()
+
+# ========= ALGORITMO PRINCIPAL =========
+# O GA roda numa thread em segundo plano, sem pausa, e publica o retrato mais
+# recente (melhor solução e histórico) num EstadoCompartilhado. A thread
+# principal, dona da janela do pygame, lê esse retrato e desenha a FPS quadros
+# por segundo: a tela nunca segura o GA, e um retrato novo só substitui o antigo.
+
+class EstadoCompartilhado:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.parar = threading.Event()
+        self.geracao = 0
+        self.desperdicio = float("inf")
+        self.bins = []
+        self.versao = 0     # muda a cada melhoria publicada
+        self.convergencia = RegistroConvergencia()
+
+    def publicar_geracao(self, geracao, desperdicio):
+        with self.lock:
+            self.geracao = geracao
+            self.convergencia.registrar(geracao, desperdicio)
+
+    def publicar_melhoria(self, desperdicio, bins):
+        with self.lock:
+            self.desperdicio = desperdicio
+            self.bins = bins
+            self.versao += 1
+
+    def retrato(self):
+        # Cópia consistente para desenhar fora do lock
+        with self.lock:
+            return (self.geracao, self.desperdicio, self.bins, self.versao,
+                    list(self.convergencia.historico()), self.convergencia.maximo)
+
+def _executar_ga(estado, pop_size, elite_frac, mutant_frac, inherit_prob, instancia, cache_size, decoder,
+                 semente):
+    # Laço do GA da thread de fundo: só decodifica as bins quando o melhor melhora
+    rng = np.random.default_rng(semente)
+    population = random_population(pop_size, num_genes(instancia, decoder), rng)
+    desperdicios = None
+    cache = FitnessCache(cache_size) if cache_size else None
+    elite_size = int(elite_frac * pop_size)
+    mutant_size = int(mutant_frac * pop_size)
+    melhor_desperdicio = float("inf")
+
+    geracao = 0
+    while not estado.parar.is_set():
+        # Avaliar população (só mutantes e filhos; elites trazem o fitness)
+        desperdicios = avaliar_populacao(population, desperdicios, instancia, cache, decoder=decoder)
+        ordem = ranquear(desperdicios, max(elite_size, 1))
+        desperdicio = desperdicios[ordem[0]]
+
+        if desperdicio < melhor_desperdicio:
+            melhor_desperdicio = desperdicio
+            bins, _ = decode(population[ordem[0]], instancia, decoder)
+            estado.publicar_melhoria(desperdicio, bins)
+        estado.publicar_geracao(geracao, desperdicio)
+
+        # Nova população
+        population = proxima_geracao(population, ordem, elite_size, mutant_size, inherit_prob, rng)
+        desperdicios = desperdicios[ordem[:elite_size]]
+        geracao += 1
+
+def brkga_visual(pop_size, elite_frac, mutant_frac, inherit_prob, instancia=INSTANCIA,
+                 cache_size=CACHE_SIZE, decoder=DECODER, semente=None):
+    estado = EstadoCompartilhado()
+    ga = threading.Thread(
+        target=_executar_ga,
+        args=(estado, pop_size, elite_frac, mutant_frac, inherit_prob, instancia, cache_size, decoder, semente),
+        daemon=True,
+    )
+    ga.start()
+
+    versao_desenhada = 0
+    melhor_desperdicio = float("inf")
+    melhor_num_bins = float("inf")
+    efeito_frames = 0
+    melhoria_valor = None
+    melhoria_bins = None
+    rodando = True
+
+    try:
+        while rodando:
+            # Eventos (permite fechar janela e sair com ESC)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    rodando = False
+
+            geracao, desperdicio, bins, versao, historico, max_desperdicio = estado.retrato()
+            if not bins:
+                clock.tick(FPS)
+                continue
+
+            if versao != versao_desenhada:
+                num_bins = len(bins)
+                if melhor_desperdicio < float("inf"):
+                    melhoria_valor = melhor_desperdicio - desperdicio
+                    melhoria_bins = melhor_num_bins - num_bins if num_bins < melhor_num_bins else None
+                    efeito_frames = 20
+                melhor_desperdicio = desperdicio
+                melhor_num_bins = num_bins
+                versao_desenhada = versao
+
+            desenhar_bins_e_grafico(
+                bins, geracao, desperdicio, historico, max_desperdicio,
+                destaque=efeito_frames > 0,
+                melhoria_valor=melhoria_valor if efeito_frames > 0 else None,
+                melhoria_bins=melhoria_bins if efeito_frames > 0 else None,
+                capacidade=instancia.capacidade,
+            )
+            if efeito_frames > 0:
+                efeito_frames -= 1
+            clock.tick(FPS)  # taxa de atualização da tela, independente do GA
+    finally:
+        estado.parar.set()
+        ga.join()
+
+def executar_visual(pop_size=POP_SIZE, elite_frac=ELITE_FRAC, mutant_frac=MUTANT_FRAC,
+                    inherit_prob=INHERIT_PROB, instancia=INSTANCIA, decoder=DECODER, semente=None):
+    global screen, clock, font, layout_quadro
+    pygame.init()
+    screen = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
+    pygame.display.set_caption("BRKGA - Bin Packing")
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont(None, 24)
+    # Fonte nova: refaz o cache de renderização, com as letras dos tipos já prontas
+    layout_quadro = None
+    glifos.clear()
+    superficies_bin.clear()
+    for tipo in CORES:
+        glifo(tipo)
+    brkga_visual(pop_size, elite_frac, mutant_frac, inherit_prob, instancia, decoder=decoder, semente=semente)
+    pygame.quit()
@@ -1,390 +1,199 @@
-import random
-import pygame
-import csv
-import os
-from datetime import datetime
-import traceback
-
-import matplotlib.pyplot as plt
-
-# ========= PARAMETROS DO PROBLEMA =========
-ITEM_TYPES = {"P": 1.5, "M": 1.55, "G": 1.90, "GG": 2.20}
-n=10
-CAMISA_COUNTS = {"P": n*5, "M": n*15, "G": n*10, "GG": n*7}
-BIN_CAPACITY = 5.0
-
-# PARAMETROS DO ALG. GENÉTICO
-POP_SIZE = 100
-ELITE_FRAC = 0.2
-MUTANT_FRAC = 0.4
-INHERIT_PROB = 0.5
-
-# PARAMETROS DE INTERFACE GRÁFICA
-CORES = {"P": (255, 100, 100), "M": (100, 255, 100), "G": (100, 100, 255), "GG": (240, 240, 50)}
-LARGURA_TELA, ALTURA_TELA = 1200, 700
-BG = (30, 30, 30)
-BRANCO = (255, 255, 255)
-AMARELO = (255, 255, 0)
-
-# ========= FUNÇÕES DO ALG. GENÉTICO  =========
-
-def random_individual():
-    # Gera um vetor de R^n onde cada componente pertece à [0,1]
-    tamanho = sum(CAMISA_COUNTS.values())
-    return [random.random() for _ in range(tamanho)]
-
-def decode(individual):
-    # Monta uma lista fixa com a demanda. Ex.: [P,P,M,M,M,G,G,G,G,GG]
-    tipos_ordenados = []
-    for tipo, qtd in CAMISA_COUNTS.items():
-        tipos_ordenados.extend([tipo] * qtd)
-
-    # Ordena índices pelo gene float (menor para maior)
-    indices = range(len(individual))
-    indices_ordenados = sorted( indices, key=lambda i: individual[i])
-
-    # Sequência de camisas na ordem dos genes ordenados
-    individuo_ordenado = [tipos_ordenados[i] for i in indices_ordenados]
-
-    # Divide a sequencia, tentando ocupar todo o bin, na medida do possível
-    bins = []
-    current_bin = []
-    current_sum = 0.0
-    sobra_total = 0.0
-
-    for i, tipo in enumerate(individuo_ordenado):
-        size = ITEM_TYPES[tipo]
-        if current_sum + size <= BIN_CAPACITY:
-            current_bin.append((i, tipo, size))
-            current_sum += size
-        else:
-            bins.append(current_bin)
-            sobra_total += BIN_CAPACITY - current_sum
-            current_bin = [(i, tipo, size)]
-            current_sum = size
-
-    if current_bin:
-        bins.append(current_bin)
-        sobra_total += BIN_CAPACITY - current_sum
-
-    return bins, sobra_total
-
-def fitness(individual):
-    bins_usados, sobra = decode(individual)
-    return sobra
-
-def biased_crossover(elite, non_elite, inherit_prob=INHERIT_PROB):
-    # Crossover clássico gene a gene
-    child = []
-    for e_gene, n_gene in zip(elite, non_elite):
-        if random.random() < inherit_prob:
-            child.append(e_gene)
-        else:
-            child.append(n_gene)
-    return child
-
-# ========= FUNÇÕES DE VISUALIZAÇÃO =========
-
-def desenhar_grafico(historico, x, y, largura, altura, max_valor):
-    if len(historico) < 2:
-        return
-    max_valor = max_valor if max_valor > 0 else 1
-    pontos = len(historico)
-    escala_y = altura / max_valor
-    escala_x = largura / (pontos - 1)
-
-    for i in range(pontos - 1):
-        x1 = x + i * escala_x
-        y1 = y + altura - historico[i] * escala_y
-        x2 = x + (i + 1) * escala_x
-        y2 = y + altura - historico[i + 1] * escala_y
-        pygame.draw.line(screen, AMARELO, (x1, y1), (x2, y2), 2)
-
-    pygame.draw.line(screen, BRANCO, (x, y), (x, y + altura), 2)
-    pygame.draw.line(screen, BRANCO, (x, y + altura), (x + largura, y + altura), 2)
-
-    texto_max = font.render(f"{max_valor:.2f}", True, BRANCO)
-    screen.blit(texto_max, (x - texto_max.get_width() - 5, y))
-import math
-def desenhar_bins_e_grafico(bins, geracao, desperdicio, historico, max_desperdicio,
-                            destaque=False, melhoria_valor=None, melhoria_bins=None):
-    screen.fill(BG)
-    bin_altura = 16
-    altura_disponivel = ALTURA_TELA - 100
-    bins_por_coluna = altura_disponivel // bin_altura
-    total_bins = len(bins)
-    num_colunas = max(1, math.ceil(total_bins / bins_por_coluna))
-
-    area_grafico = 250  # largura reservada à direita para info e gráfico
-    largura_coluna = (LARGURA_TELA - area_grafico) // num_colunas
-
-    escala_max = 80
-    escala = min(escala_max, largura_coluna / BIN_CAPACITY - 5)
-
-    for i, bin in enumerate(bins[:bins_por_coluna * num_colunas]):
-        coluna = i // bins_por_coluna
-        linha = i % bins_por_coluna
-        x_inicial = 10 + coluna * (largura_coluna + 10)
-        y = 10 + linha * bin_altura
-
-        x_atual = x_inicial
-        for _, tipo, tamanho in bin:
-            largura = round(tamanho * escala)
-            pygame.draw.rect(screen, CORES[tipo], (x_atual, y, largura, 12))
-            if destaque:
-                pygame.draw.rect(screen, BRANCO, (x_atual, y, largura, 12), 1)
-
-            # Desenha a letra correspondente, centralizada no retângulo
-            letra = tipo
-            letra_surface = font.render(letra, True, BRANCO)
-            letra_rect = letra_surface.get_rect(center=(x_atual + largura // 2, y + 6))
-            screen.blit(letra_surface, letra_rect)
-
-            x_atual += largura + 1  # avança a largura desenhada + espaçamento
-
-
-    # Info lateral à direita
-    base_x = num_colunas * (largura_coluna + 10) + 10
-    screen.blit(font.render(f"Geração: {geracao + 1}", True, BRANCO), (base_x, 20))
-    screen.blit(font.render(f"Sobra: {desperdicio:.2f}m", True, BRANCO), (base_x, 50))
-    screen.blit(font.render(f"Bins usados: {len(bins)}", True, BRANCO), (base_x, 80))
-
-    if melhoria_valor is not None:
-        screen.blit(font.render(f"-{melhoria_valor:.2f}", True, AMARELO), (base_x + 140, 50))
-    if melhoria_bins is not None:
-        screen.blit(font.render(f"-{melhoria_bins}", True, AMARELO), (base_x + 140, 80))
-
-    desenhar_grafico(historico, base_x, 110, 180, 580, max_desperdicio)
-    pygame.display.flip()
-
-# ========= ALGORITMO PRINCIPAL =========
-def brkga_visual(pop_size, elite_frac, mutant_frac, inherit_prob):
-    population = [random_individual() for _ in range(pop_size)]
-    elite_size = int(elite_frac * pop_size)
-    mutant_size = int(mutant_frac * pop_size)
-    melhor_desperdicio = float("inf")
-    melhor_num_bins = float("inf")
-    efeito_frames = 0
-    melhoria_valor = None
-    melhoria_bins = None
-    historico_desperdicio = []
-
-    geracao = 0
-    rodando = True
-
-    while rodando:
-        # Eventos (permite fechar janela e sair com ESC)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                rodando = False
-
-        # Avaliar população
-        pop_fitness = [(fitness(ind), ind) for ind in population]
-        pop_fitness.sort(key=lambda x: x[0])
-
-        melhor = pop_fitness[0][1]
-        desperdicio = pop_fitness[0][0]
-        bins, _ = decode(melhor)
-        num_bins = len(bins)
-
-        historico_desperdicio.append(desperdicio)
-        max_desperdicio = max(historico_desperdicio)
-
-        if desperdicio < melhor_desperdicio:
-            melhoria_valor = melhor_desperdicio - desperdicio
-            melhoria_bins = melhor_num_bins - num_bins if num_bins < melhor_num_bins else None
-            melhor_desperdicio = desperdicio
-            melhor_num_bins = num_bins
-            efeito_frames = 20
-
-        if geracao % 10 == 0:
-            desenhar_bins_e_grafico(
-                bins, geracao, desperdicio, historico_desperdicio, max_desperdicio,
-                destaque=efeito_frames > 0,
-                melhoria_valor=melhoria_valor if efeito_frames > 0 else None,
-                melhoria_bins=melhoria_bins if efeito_frames > 0 else None,
+import argparse
+
+# Núcleo do solver, sem dependências gráficas: pode ser importado direto daqui ou do pacote brkga
+from brkga import (  # noqa: F401
+    INSTANCIA, Instance, biased_crossover, brgka_simples, decode, fitness, random_individual,
+)
+from brkga.parametros import ELITE_FRAC, INHERIT_PROB, INTERVALO_CHECKPOINT, MUTANT_FRAC, POP_SIZE
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="BRKGA para o corte de camisas em rolos de tecido")
+    subcomandos = parser.add_subparsers(dest="comando")
+
+    benchmark = subcomandos.add_parser("benchmark", help="testes de performance com CSV e gráfico (padrão)")
+    benchmark.add_argument("--geracoes", type=int, nargs="+", default=[5000000],
+                           help="quantidades de gerações a testar")
+    benchmark.add_argument("--repeticoes", type=int, default=2, help="execuções por quantidade de gerações")
+    benchmark.add_argument("--workers", type=int, default=None,
+                           help="processos simultâneos (padrão: todos os núcleos)")
+    benchmark.add_argument("--semente", type=int, default=None)
+    benchmark.add_argument("--sem-grafico", action="store_true", help="só salva o CSV")
+    benchmark.add_argument("--nao-mostrar", action="store_true", help="salva o gráfico sem abrir a janela")
+    benchmark.add_argument("--convergencia", action="store_true",
+                           help="grava a convergência de cada execução e plota as curvas")
+
+    executar = subcomandos.add_parser("executar", help="uma execução longa, com checkpoint e partida a quente")
+    executar.add_argument("--geracoes", type=int, default=5000000)
+    executar.add_argument("--pop-size", type=int, default=POP_SIZE)
+    executar.add_argument("--semente", type=int, default=None)
+    executar.add_argument("--checkpoint", default=None, help="arquivo .npz gravado periodicamente")
+    executar.add_argument("--intervalo-checkpoint", type=int, default=INTERVALO_CHECKPOINT,
+                          help="gerações entre gravações do checkpoint")
+    executar.add_argument("--retomar", action="store_true", help="continua do --checkpoint, se existir")
+    executar.add_argument("--aquecer", default=None, metavar="ARQUIVO",
+                          help="parte das elites de um checkpoint .npz, dos Melhor_Solucao de um CSV "
+                               "ou das melhores execuções de um armazém .idx")
+    executar.add_argument("--busca-local", type=int, default=None, metavar="GERACOES",
+                          help="busca local nas melhores elites a cada tantas gerações")
+    executar.add_argument("--metricas", default=None, metavar="ARQUIVO",
+                          help="grava as métricas por geração em JSON Lines e mostra o tempo por fase")
+
+    visual = subcomandos.add_parser("visual", help="acompanha a evolução numa janela do pygame")
+    visual.add_argument("--pop-size", type=int, default=POP_SIZE)
+    visual.add_argument("--semente", type=int, default=None)
+
+    colunas = subcomandos.add_parser("colunas", help="plano por geração de colunas e limite inferior do LP")
+    colunas.add_argument("--refinar", type=int, default=0, metavar="GERACOES",
+                         help="roda o BRKGA a partir do plano por essa quantidade de gerações")
+
+    pedidos = subcomandos.add_parser("pedidos", help="resolve um lote de pedidos, com cache dos resultados")
+    pedidos.add_argument("arquivo", help="JSON com uma lista de pedidos, cada um {tamanho: quantidade}")
+    pedidos.add_argument("--geracoes", type=int, default=100000)
+    pedidos.add_argument("--workers", type=int, default=None,
+                         help="processos simultâneos (padrão: todos os núcleos)")
+    pedidos.add_argument("--semente", type=int, default=None)
+    pedidos.add_argument("--sem-cache", action="store_true", help="não lê nem grava o cache em disco")
+
+    desempenho = subcomandos.add_parser("desempenho", help="mede a vazão dos caminhos quentes do GA")
+    desempenho.add_argument("--tamanhos", type=int, nargs="+", default=[10, 100, 1000],
+                            help="valores de n da instância (n de parametros.py)")
+    desempenho.add_argument("--pops", type=int, nargs="+", default=[100, 1000], help="tamanhos de população")
+    desempenho.add_argument("--tempo", type=float, default=0.5, help="segundos de medição por operação")
+    desempenho.add_argument("--semente", type=int, default=0)
+    desempenho.add_argument("--salvar-base", action="store_true", help="grava a medição como linha de base")
+    desempenho.add_argument("--comparar", nargs="?", const="", default=None, metavar="JSON",
+                            help="compara com uma medição salva (padrão: a linha de base)")
+    desempenho.add_argument("--tolerancia", type=float, default=0.10,
+                            help="queda de vazão aceita antes de acusar regressão")
+
+    resultados = subcomandos.add_parser("resultados", help="resume ou exporta o armazém binário de resultados")
+    resultados.add_argument("--armazem", default=None, metavar="BASE",
+                            help="caminho sem extensão (padrão: brkga_resultados/resultados)")
+    resultados.add_argument("--geracoes", type=int, default=None, help="só execuções com essas gerações")
+    resultados.add_argument("--semente", type=int, default=None, help="só a execução com essa semente")
+    resultados.add_argument("--exportar", default=None, metavar="CSV", help="exporta as execuções para CSV")
+
+    plot = subcomandos.add_parser("plot", help="refaz o gráfico de um CSV de resultados")
+    plot.add_argument("csv", nargs="+")
+    plot.add_argument("--png", default=None, help="arquivo de imagem a salvar")
+    plot.add_argument("--convergencia", action="store_true",
+                      help="os CSVs são de convergência: uma curva por arquivo")
+    return parser
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    if args.comando is None:
+        args = parser.parse_args(["benchmark"])
+
+    # Imports tardios: cada subcomando só carrega o que usa
+    if args.comando == "benchmark":
+        from brkga.experimentos import executar_benchmark
+        executar_benchmark(
+            args.geracoes, args.repeticoes, max_workers=args.workers, semente=args.semente,
+            plotar=not args.sem_grafico, mostrar=not args.nao_mostrar, convergencia=args.convergencia,
+        )
+    elif args.comando == "executar":
+        from brkga.checkpoint import elites_de_checkpoint, sementes_de_csv
+        from brkga.instrumentacao import GravadorMetricas, ResumoFases
+        populacao_inicial = None
+        if args.aquecer is not None:
+            if args.aquecer.endswith(".csv"):
+                populacao_inicial = sementes_de_csv(args.aquecer)
+            elif args.aquecer.endswith(".idx"):
+                from brkga.armazem import ArmazemResultados
+                populacao_inicial = ArmazemResultados(args.aquecer[:-4]).sementes()
+                if len(populacao_inicial) == 0:
+                    print(f"{args.aquecer} não tem execuções desta instância: partindo sem sementes")
+            else:
+                populacao_inicial = elites_de_checkpoint(args.aquecer)
+        observadores = []
+        if args.metricas is not None:
+            gravador = GravadorMetricas(args.metricas)
+            resumo = ResumoFases()
+            observadores = [gravador, resumo]
+        try:
+            num_bins, desperdicio, _, motivo_parada = brgka_simples(
+                args.geracoes, args.pop_size, ELITE_FRAC, MUTANT_FRAC, INHERIT_PROB,
+                populacao_inicial=populacao_inicial, arquivo_checkpoint=args.checkpoint,
+                intervalo_checkpoint=args.intervalo_checkpoint, retomar=args.retomar, semente=args.semente,
+                observadores=observadores, intervalo_busca_local=args.busca_local,
             )
-            if efeito_frames > 0:
-                efeito_frames -= 1
-
-        # Nova população
-        new_pop = [ind for _, ind in pop_fitness[:elite_size]]
-        for _ in range(mutant_size):
-            new_pop.append(random_individual())
-        while len(new_pop) < pop_size:
-            elite = random.choice(new_pop[:elite_size])
-            non_elite = random.choice(population[elite_size:])
-            filho = biased_crossover(elite, non_elite, inherit_prob)
-            new_pop.append(filho)
-
-        population = new_pop
-        geracao += 1
-        clock.tick(60)  # taxa de atualização
-
-import time
-
-def brgka_simples(num_geracoes, pop_size, elite_frac, mutant_frac, inherit_prob):
-    
-    population = [random_individual() for _ in range(pop_size)]
-    elite_size = int(elite_frac * pop_size)
-    mutant_size = int(mutant_frac * pop_size)
-
-    melhor_individuo = None
-    melhor_desperdicio = float("inf")
-
-    for geracao in range(num_geracoes):
-        # Avaliar população
-        pop_fitness = [ (fitness(ind) , ind) for ind in population]
-        pop_fitness.sort(key=lambda x: x[0])
-
-        desperdicio_atual = pop_fitness[0][0]
-        melhor_atual = pop_fitness[0][1]
-
-        if desperdicio_atual < melhor_desperdicio:
-            melhor_desperdicio = desperdicio_atual
-            melhor_individuo = melhor_atual
-
-        # Nova população
-        new_pop = [ind for _, ind in pop_fitness[:elite_size]]
-        for _ in range(mutant_size):
-            new_pop.append(random_individual())
-        while len(new_pop) < pop_size:
-            elite = random.choice(new_pop[:elite_size])
-            non_elite = random.choice(population[elite_size:])
-            filho = biased_crossover(elite, non_elite, inherit_prob)
-            new_pop.append(filho)
-
-        population = new_pop
-
-    # Decode final
-    bins, desperdicio_final = decode(melhor_individuo)
-    num_bins = len(bins)
-    sequencia_de_corte = [ [tipo for _, tipo, _ in bin] for bin in bins]
-
-    return num_bins, desperdicio_final, sequencia_de_corte
-
-# ==================================================================
-# ===================== EXECUÇÃO PRINCIPAL =========================
-# ==================================================================
-
-# ========= INTERFACE VISUAL =========
-# pygame.init()
-# screen = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
-# pygame.display.set_caption("BRKGA - Bin Packing")
-# clock = pygame.time.Clock()
-# font = pygame.font.SysFont(None, 24)
-# brkga_visual(POP_SIZE, ELITE_FRAC, MUTANT_FRAC, INHERIT_PROB)
-# pygame.quit()
-
-# ============ TESTES DE PERFORMANCE =======================
-import os
-import csv
-import time
-import traceback
-from datetime import datetime
-import matplotlib.pyplot as plt
-
-# Parâmetros de teste
-num_repeticoes = 2                                                  # multiplicador do tempo computacional
-print(f"Vamos rodar o problema {num_repeticoes}x. Estas serão as quantidades de gerações:")
-# num_geracoes = [100,500,1000, 5000, 10000, 50000, 100000, 500000] # verificar a evolução das soluções (lento)
-num_geracoes = [5000000]                                          # tentar achar um ótimo 
-# num_geracoes = [10,100,1000]                                        # exemplo rápido
-print(num_geracoes)
-
-cores = ['royalblue', 'darkorange', 'seagreen', 'firebrick', 'purple']
-
-resultados_individuais = []
-resultados_medios = []
-for n_geracoes in num_geracoes:
-    tempos = []
-    desperdicios = []
-
-    print(f" == Rodando {n_geracoes} gerações, {num_repeticoes} vezes ==")
-    for rep in range(num_repeticoes):
-        print(f"  Execução {rep+1}/{num_repeticoes}...")
-        inicio = time.time()
-        num_bins, desperdicio, sequencia_camisas = brgka_simples(
-            n_geracoes, POP_SIZE, ELITE_FRAC, MUTANT_FRAC, INHERIT_PROB
+        finally:
+            if args.metricas is not None:
+                gravador.close()
+        if args.metricas is not None:
+            print(resumo.relatorio())
+        print(f"{num_bins} bins, desperdício {desperdicio:.2f} m (parada: {motivo_parada})")
+    elif args.comando == "visual":
+        from brkga.visual import executar_visual
+        executar_visual(args.pop_size, ELITE_FRAC, MUTANT_FRAC, INHERIT_PROB, semente=args.semente)
+    elif args.comando == "colunas":
+        from brkga.colunas import limite_inferior_lp, resolver_colunas, sementes_colunas
+        num_bins, desperdicio, _, motivo_parada = resolver_colunas()
+        limite_bins, limite_desperdicio = limite_inferior_lp()
+        print(f"Geração de colunas: {num_bins} bins, desperdício {desperdicio:.2f} m ({motivo_parada})")
+        print(f"Limite inferior do LP: {limite_bins} bins, desperdício {limite_desperdicio:.2f} m")
+        if args.refinar and motivo_parada != "otimo":
+            populacao_inicial, limite_inferior = sementes_colunas()
+            num_bins, desperdicio, _, motivo_parada = brgka_simples(
+                args.refinar, POP_SIZE, ELITE_FRAC, MUTANT_FRAC, INHERIT_PROB,
+                populacao_inicial=populacao_inicial, limite_inferior=limite_inferior,
+            )
+            print(f"BRKGA refinado: {num_bins} bins, desperdício {desperdicio:.2f} m ({motivo_parada})")
+    elif args.comando == "pedidos":
+        import json
+        from brkga.pedidos import PASTA_CACHE_PEDIDOS, resolver_pedidos
+        with open(args.arquivo, encoding="utf-8") as arquivo:
+            lista_pedidos = json.load(arquivo)
+        resultados = resolver_pedidos(
+            lista_pedidos, args.geracoes, max_workers=args.workers, semente=args.semente,
+            pasta_cache=None if args.sem_cache else PASTA_CACHE_PEDIDOS,
         )
-        duracao = time.time() - inicio
-
-        tempos.append(duracao)
-        desperdicios.append(desperdicio)
-
-        resultados_individuais.append((
-            n_geracoes, duracao, desperdicio, rep + 1,
-            num_bins, sequencia_camisas
-        ))
-    
-    tempo_medio = sum(tempos) / len(tempos)
-    desperdicio_medio = sum(desperdicios) / len(desperdicios)
-    resultados_medios.append((n_geracoes, tempo_medio, desperdicio_medio))
-
-# ================== SALVAR COM TIMESTAMP =====================
-output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "brkga_resultados")
-os.makedirs(output_dir, exist_ok=True)
-
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-csv_filename = os.path.join(output_dir, f"resultados_{timestamp}.csv")
-png_filename = os.path.join(output_dir, f"grafico_{timestamp}.png")
-
-try:
-    with open(csv_filename, mode="w", newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        writer.writerow([
-            "Geracoes", "Tempo_execucao_s", "Desperdicio_m", "Repeticao", "Num_Bins", "Melhor_Solucao"
-        ])
-        for linha in resultados_individuais:
-            writer.writerow(linha)
-    print(f"CSV salvo como: {csv_filename}")
-except Exception:
-    print("Erro ao salvar CSV:")
-    traceback.print_exc()
-
-# ================== PLOT =====================
-plt.figure(figsize=(10, 6))
-desps_individuais = [desp for (_, _, desp, _, _, _) in resultados_individuais]
-desps_medios = [r[2] for r in resultados_medios]
-desps_unicos = sorted(set(desps_individuais + desps_medios))
-
-labels_usados = set()
-for ger, tempo, desp, rep, num_bins, _ in resultados_individuais:
-    label = f'{ger}g - rep {rep}'
-    cor = cores[rep % len(cores)]
-    if label not in labels_usados:
-        plt.plot(tempo, desp, 'o', color=cor, label=label)
-        labels_usados.add(label)
-    else:
-        plt.plot(tempo, desp, 'o', color=cor)
-
-    # Mostra número de bins ao lado do ponto
-    plt.annotate(f"{num_bins}", xy=(tempo, desp), xytext=(5, 0),
-                 textcoords="offset points", ha='left', va='center', fontsize=8)
-
-# Linha da média
-tempos_medios = [r[1] for r in resultados_medios]
-plt.plot(tempos_medios, desps_medios, '-o', color='black', linewidth=2, label='Média')
-
-plt.yticks(desps_unicos, [f'{v:.2f}' for v in desps_unicos])
-plt.title("BRKGA - Desperdício por Execução e Média")
-plt.xlabel("Tempo de execução (s)")
-plt.ylabel("Desperdício final (m)")
-plt.grid(True)
-plt.legend()
-plt.tight_layout()
+        for k, (num_bins, desperdicio, _, motivo_parada, origem) in enumerate(resultados):
+            print(f"Pedido {k}: {num_bins} bins, desperdício {desperdicio:.2f} m "
+                  f"({origem}, parada: {motivo_parada})")
+    elif args.comando == "desempenho":
+        from brkga.desempenho import (
+            LINHA_DE_BASE, carregar_desempenho, comparar, executar_suite, relatorio_comparacao,
+            relatorio_desempenho, salvar_desempenho,
+        )
+        medicao = executar_suite(args.tamanhos, args.pops, args.tempo, args.semente)
+        print(relatorio_desempenho(medicao))
+        print(f"Medição salva em {salvar_desempenho(medicao)}")
+        if args.comparar is not None:
+            comparacao = comparar(carregar_desempenho(args.comparar or LINHA_DE_BASE), medicao, args.tolerancia)
+            print(relatorio_comparacao(comparacao))
+            if any(regressao for *_, regressao in comparacao):
+                raise SystemExit("Há operações mais lentas que a linha de base")
+        if args.salvar_base:
+            print(f"Linha de base salva em {salvar_desempenho(medicao, LINHA_DE_BASE)}")
+    elif args.comando == "resultados":
+        import numpy as np
+        from brkga.armazem import ArmazemResultados
+        from brkga.experimentos import ARMAZEM_PADRAO
+        armazem = ArmazemResultados(args.armazem or ARMAZEM_PADRAO)
+        linhas = armazem.consultar(geracoes=args.geracoes, semente=args.semente)
+        indice = armazem.indice[linhas]
+        print(f"{len(linhas)} de {len(armazem)} execuções")
+        for n_geracoes in np.unique(indice["geracoes"]):
+            grupo = indice[indice["geracoes"] == n_geracoes]
+            print(f"  {n_geracoes} gerações: {len(grupo)} execuções, desperdício médio "
+                  f"{grupo['desperdicio'].mean():.2f} m (melhor {grupo['desperdicio'].min():.2f} m), "
+                  f"tempo médio {grupo['tempo'].mean():.1f}s")
+        if args.exportar is not None:
+            armazem.exportar_csv(args.exportar, linhas)
+    elif args.comando == "plot":
+        from brkga.experimentos import carregar_csv, plotar_convergencia, plotar_resultados
+        if args.convergencia:
+            plotar_convergencia(args.csv, args.png, mostrar=args.png is None)
+        elif len(args.csv) > 1:
+            parser.error("o gráfico de resultados usa um CSV só")
+        else:
+            resultados_individuais, resultados_medios = carregar_csv(args.csv[0])
+            plotar_resultados(resultados_individuais, resultados_medios, args.png, mostrar=args.png is None)
 
-# Salvar imagem
-try:
-    plt.savefig(png_filename, dpi=300)
-    print(f"Imagem salva como: {png_filename}")
-except Exception:
-    print("Erro ao salvar imagem:")
-    traceback.print_exc()
+    print("programa finalizado corretamente.")
 
-plt.show()
-print("programa finalizado corretamente.")
-# input("Pressione ENTER para encerrar...")
+if __name__ == "__main__":
+    main()